@@ -0,0 +1,225 @@
+"""Offline benchmark of the Google result parsing pipeline
+
+Replays saved Google result pages through each parsing stage without any
+network access, reporting throughput and memory allocations per stage.
+
+Without a corpus, deterministic pages from benchmarks.synthetic_pages are
+used, so results are comparable between checkouts. Real result pages (e.g.
+saved with the bot's User-Agent) can be replayed by passing a folder of
+.html files. Run from the bot directory:
+
+    python -m benchmarks.google_parsing [corpus] [-n iterations]
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks import reference_google
+from benchmarks.synthetic_pages import synthetic_pages
+from cogs.search_engine_funcs import google
+from functions.html_stream import HTMLBlockStream
+
+
+def stream_blocks(html: bytes, chunk_size: int = 16384) -> List[str]:
+    """Splits a page into result blocks, as received in chunks
+
+    Parameters
+    ----------
+    html : bytes
+        Raw result page
+    chunk_size : int
+        (Optional) Bytes fed per chunk. (Default=16384)
+
+    Returns
+    -------
+    List[str]
+        HTML of the children of div#main
+    """
+    stream = HTMLBlockStream("main")
+    blocks = []
+    for i in range(0, len(html), chunk_size):
+        blocks.extend(stream.feed(html[i : i + chunk_size]))
+    blocks.extend(stream.close())
+    return blocks
+
+
+def measure(func: Callable, pages: list, iterations: int) -> dict:
+    """Runs a stage over every page and measures it
+
+    Parameters
+    ----------
+    func : Callable
+        Stage taking the prepared input of a single page
+    pages : list
+        Prepared inputs, one per page
+    iterations : int
+        Passes over all pages used for timing
+
+    Returns
+    -------
+    dict
+        ops/sec (pages per second), peak traced memory and allocated blocks
+    """
+    # allocations are measured on a separate pass, tracing slows down timing
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for page in pages:
+        func(page)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocations = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+
+    t0 = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            func(page)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "ops": iterations * len(pages) / elapsed if elapsed else float("inf"),
+        "peak_kib": peak / 1024,
+        "allocations": allocations,
+    }
+
+
+def parity_errors(fragments: List[List[str]]) -> List[int]:
+    """Compares the extraction against the pre-ResultBlock reference
+
+    Parameters
+    ----------
+    fragments : List[List[str]]
+        Result blocks of each page, from stream_blocks
+
+    Returns
+    -------
+    List[int]
+        Indexes of pages whose text or image results differ
+    """
+    errors = []
+    for index, page in enumerate(fragments):
+        blocks = [google.parse_block(b) for b in page]
+        soups = [google.parse_block(b).block for b in page]
+        text = google.text_results(blocks, google.result_cleanup(blocks))
+        reference_text = reference_google.text_results(
+            soups, reference_google.result_cleanup(soups)
+        )
+        images = google.image_results(google.result_cleanup(blocks))
+        reference_images = reference_google.image_results(
+            reference_google.result_cleanup(soups)
+        )
+        if text != reference_text or images != reference_images:
+            errors.append(index)
+    return errors
+
+
+def load_corpus(corpus: str) -> List[bytes]:
+    """Reads the saved result pages of a folder
+
+    Parameters
+    ----------
+    corpus : str
+        Folder of .html files
+
+    Returns
+    -------
+    List[bytes]
+        Raw HTML of each page, ordered by file name
+    """
+    files = sorted(
+        os.path.join(corpus, f) for f in os.listdir(corpus) if f.endswith(".html")
+    )
+    if not files:
+        raise SystemExit(f"No .html pages found in {corpus}")
+
+    raw_pages = []
+    for path in files:
+        with open(path, "rb") as file:
+            raw_pages.append(file.read())
+    return raw_pages
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument(
+        "corpus", nargs="?", help="folder of .html pages (default: synthetic pages)"
+    )
+    arg_parser.add_argument("-n", "--iterations", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    raw_pages = load_corpus(args.corpus) if args.corpus else synthetic_pages()
+
+    # inputs of each stage are the outputs of the stage before it
+    fragments = [stream_blocks(html) for html in raw_pages]
+    blocks = [[google.parse_block(b) for b in page] for page in fragments]
+    soups = [[block.block for block in page] for page in blocks]
+
+    errors = parity_errors(fragments)
+    if errors:
+        raise SystemExit(f"Extraction differs from the reference on pages {errors}")
+    results = [
+        google.text_results(page, google.result_cleanup(page)) for page in blocks
+    ]
+    images = [[img for block in page for img in block.images] for page in blocks]
+
+    stages = {
+        "stream": (stream_blocks, raw_pages),
+        "parse_block": (lambda page: [google.parse_block(b) for b in page], fragments),
+        "result_cleanup": (google.result_cleanup, blocks),
+        "text_results": (
+            lambda page: google.text_results(page, google.result_cleanup(page)),
+            blocks,
+        ),
+        "image_url_parser": (
+            lambda page: [google.image_url_parser(img) for img in page],
+            images,
+        ),
+        "result_embed": (
+            lambda page: [google.result_embed(r, "benchmark", "") for r in page],
+            results,
+        ),
+        # cleanup and text extraction from parsed soups, scan included
+        "extract": (
+            lambda page: google.text_results(
+                scanned := [google.ResultBlock(soup) for soup in page],
+                google.result_cleanup(scanned),
+            ),
+            soups,
+        ),
+        "extract_reference": (
+            lambda page: reference_google.text_results(
+                page, reference_google.result_cleanup(page)
+            ),
+            soups,
+        ),
+        "pipeline": (
+            lambda page: google.text_results(
+                blocks := [google.parse_block(b) for b in page],
+                google.result_cleanup(blocks),
+            ),
+            fragments,
+        ),
+    }
+
+    print(
+        f"{len(raw_pages)} pages, {args.iterations} iterations, "
+        + "extraction matches the reference"
+    )
+    print(f"{'stage':<18}{'pages/sec':>12}{'peak KiB':>12}{'allocs':>10}")
+    for name, (func, pages) in stages.items():
+        stats = measure(func, pages, args.iterations)
+        print(
+            f"{name:<18}{stats['ops']:>12.1f}"
+            + f"{stats['peak_kib']:>12.1f}{stats['allocations']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
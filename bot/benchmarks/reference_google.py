@@ -0,0 +1,151 @@
+"""Google result extraction as it was before ResultBlock
+
+Kept unchanged, apart from returning SearchResult, as the reference that
+benchmarks.google_parsing checks the optimised extraction against and
+times it next to. Do not optimise this module.
+
+The original link lookup was find_all("a", href_=""). With the pinned
+beautifulsoup4 (4.11.1) a missing attribute matches "", so it found every
+anchor, but newer versions find none. It is written as find_all("a") so
+the reference behaves as the bot did whatever version is installed.
+"""
+
+import re
+from typing import List
+
+from bs4 import BeautifulSoup
+from cogs.search_engine_funcs.generic_search import SearchResult
+
+
+def link_unicode_parse(link: str) -> str:
+    return re.sub(r"%(.{2})", lambda m: chr(int(m.group(1), 16)), link)
+
+
+def image_url_parser(image: BeautifulSoup) -> str:
+    try:
+        imgurl = link_unicode_parse(
+            re.findall("(?<=imgurl=).*(?=&imgrefurl)", image.parent.parent["href"])[0]
+        )
+        if "encrypted" in imgurl:
+            imgurl = re.findall(
+                "(?<=imgurl=).*(?=&imgrefurl)",
+                image.findAll("img")[1].parent.parent["href"],
+            )[0]
+
+        return imgurl
+    except Exception:
+        return ""
+
+
+def text_result(result: BeautifulSoup) -> SearchResult:
+    find_link = result.find_all("a")
+    link_list = tuple(a for a in find_link if not a.find("img"))
+    link = None
+    if len(link_list) != 0:
+        try:
+            link = link_unicode_parse(
+                re.findall(r"(?<=url\?q=).*(?=&sa)", link_list[0]["href"])[0]
+            )
+        except Exception:
+            pass
+
+    result_find = result.findAll("div")
+    divs = tuple(d for d in result_find if not d.find("div"))
+    titleinfo = [
+        " ".join(
+            [string if string != "View all" else "" for string in div.stripped_strings]
+        )
+        for div in divs[:2]
+    ]
+    titleinfo = [f"**{ti}**" for ti in titleinfo if ti != ""]
+    if link is not None:
+        titleinfo[-1] = link
+
+    lines = [
+        " ".join(
+            [string if string != "View all" else "" for string in div.stripped_strings]
+        )
+        for div in divs[2:]
+    ]
+
+    printstring = "\n".join(titleinfo + lines)
+    if len(printstring) > 1024:
+        printstring = printstring[:1020] + "..."
+
+    return SearchResult(
+        description=re.sub("\n\n+", "\n\n", printstring),
+        image_url=image_url_parser(result.find("img")),
+    )
+
+
+def featured_snippet_result(result: BeautifulSoup) -> SearchResult:
+    printstring = "\n".join(
+        [
+            "\n".join(
+                [
+                    string if string != "View all" else ""
+                    for string in tuple(div.stripped_strings)[:2]
+                ]
+            )
+            for div in result
+        ]
+    )
+    if len(printstring) > 1024:
+        printstring = printstring[:1020] + "..."
+
+    return SearchResult(description=re.sub("\n\n+", "\n\n", printstring), featured=True)
+
+
+def result_cleanup(blocks: List[BeautifulSoup]) -> List[BeautifulSoup]:
+    results = blocks[3 : len(blocks) - 2]
+
+    wrong_first_results = {
+        "Did you mean: ",
+        "Showing results for ",
+        "Tip: ",
+        "See results about",
+        "Related searches",
+        "Including results for ",
+        "Top stories",
+        "People also ask",
+        "Next >",
+    }
+    return [
+        result
+        for result in results
+        if not any(badResult in result.strings for badResult in wrong_first_results)
+        or result.strings == ""
+    ]
+
+
+def text_results(
+    blocks: List[BeautifulSoup], filtered_results: List[BeautifulSoup]
+) -> List[SearchResult]:
+    for idx, val in enumerate(filtered_results):
+        if "Featured Snippets" in val.text:
+            filtered_results.pop(idx)
+            break
+
+    results = [
+        result for result in map(text_result, filtered_results) if result.description
+    ]
+
+    # searching from the parent also matches the block itself
+    for block in blocks:
+        featured_snippet = block.parent.find(
+            "div", {"class": "Gx5Zad xpd EtOod pkphOe"}
+        )
+        if featured_snippet is not None:
+            results.insert(0, featured_snippet_result(featured_snippet))
+            break
+    return results
+
+
+def image_results(filtered_results: List[BeautifulSoup]) -> List[SearchResult]:
+    for result in filtered_results:
+        if "Images" in result.strings:
+            return [
+                SearchResult(description=None, image_url=image_url_parser(image))
+                for image in result.findAll("img", recursive=True)
+            ]
+    return []
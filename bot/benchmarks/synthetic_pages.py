@@ -0,0 +1,212 @@
+"""Deterministic Google-style result pages for the parsing benchmarks
+
+Pages follow the layout of the basic HTML results page the bot receives:
+three header blocks, optional featured snippet and spelling blocks, an
+image strip, organic results with percent-escaped /url?q= links, a
+"People also ask" block, related searches and two footer blocks. No real
+search content is included, and the same seed always gives the same page.
+"""
+
+import random
+from typing import List
+
+# words for result titles and snippets
+vocabulary = (
+    "study notes exam chapter lecture biology chemistry physics history "
+    "equation theorem essay review summary guide tutorial example answer "
+    "definition formula practice question problem method analysis"
+).split()
+
+
+def sentence(rng: random.Random, length: int) -> str:
+    """Joins random vocabulary words
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random generator of the page
+    length : int
+        Number of words
+
+    Returns
+    -------
+    str
+        Words separated by spaces
+    """
+    return " ".join(rng.choice(vocabulary) for _ in range(length))
+
+
+def organic_result(rng: random.Random, index: int) -> str:
+    """Builds an organic result block
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random generator of the page
+    index : int
+        Position of the result
+
+    Returns
+    -------
+    str
+        HTML of the block
+    """
+    host = f"site{index}.example.com"
+    thumbnail = (
+        '<div class="kCrYT"><a href="/imgres?imgurl=https://img.example.com/'
+        + f'{index}.jpg&amp;imgrefurl=https://{host}/"><div>'
+        + '<img class="h1hFNe" src="data:image/gif;base64,R0lGOD" alt="">'
+        + "</div></a></div>"
+        if rng.random() < 0.4
+        else ""
+    )
+    return (
+        '<div><div class="ZINbbc xpd O9g5cc uUPGi"><div class="egMi0 kCrYT">'
+        + f'<a href="/url?q=https://{host}/page%3Fid%3D{index}'
+        + '&amp;sa=U&amp;ved=2ahUKE"><h3><div class="BNeawe vvjwJb AP7Wnd">'
+        + f"{sentence(rng, rng.randint(3, 8)).title()}</div></h3>"
+        + f'<div class="BNeawe UPmit AP7Wnd">{host} › {sentence(rng, 2)}</div>'
+        + '</a></div><div class="x54gtf"></div><div class="kCrYT"><div>'
+        + '<div class="BNeawe s3v9rd AP7Wnd"><div><div>'
+        + '<div class="BNeawe s3v9rd AP7Wnd"><span class="r0bn4c rQMQod">'
+        + f"Oct {rng.randint(1, 28)}, 2022</span> · "
+        + f"{sentence(rng, rng.randint(20, 60))}</div></div></div></div></div>"
+        + f"</div>{thumbnail}</div></div>"
+    )
+
+
+def list_block(rng: random.Random, heading: str, items: int) -> str:
+    """Builds a block of search links under a heading (e.g. related searches)
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random generator of the page
+    heading : str
+        Text of the heading
+    items : int
+        Number of links
+
+    Returns
+    -------
+    str
+        HTML of the block
+    """
+    links = "".join(
+        '<div class="kCrYT"><a href="/search?q='
+        + f'{sentence(rng, 3).replace(" ", "+")}"><div class="BNeawe">'
+        + f"{sentence(rng, 3)}</div></a></div>"
+        for _ in range(items)
+    )
+    return (
+        '<div><div class="ZINbbc xpd"><div class="kCrYT"><span>'
+        + f'<div class="BNeawe">{heading}</div></span></div>{links}</div></div>'
+    )
+
+
+def image_strip(rng: random.Random) -> str:
+    """Builds the "Images" block
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random generator of the page
+
+    Returns
+    -------
+    str
+        HTML of the block
+    """
+    images = "".join(
+        f'<a href="/imgres?imgurl=https://img.example.com/strip{i}.png'
+        + f'&amp;imgrefurl=https://ref{i}.example.com/"><div>'
+        + '<img src="data:image/gif;base64,R0lGOD" alt=""></div></a>'
+        for i in range(rng.randint(5, 10))
+    )
+    return (
+        '<div><div class="ZINbbc xpd"><div class="kCrYT"><span>'
+        + '<div class="BNeawe">Images</div></span></div>'
+        + f"<div>{images}</div></div></div>"
+    )
+
+
+def featured_snippet(rng: random.Random) -> str:
+    """Builds a featured snippet block
+
+    Parameters
+    ----------
+    rng : random.Random
+        Random generator of the page
+
+    Returns
+    -------
+    str
+        HTML of the block
+    """
+    return (
+        '<div><div class="Gx5Zad xpd EtOod pkphOe"><div>'
+        + '<div class="BNeawe">Featured Snippets</div></div><div>'
+        + f"<div>{sentence(rng, 12)}</div><div>{sentence(rng, 12)}</div>"
+        + "<div>View all</div></div></div></div>"
+    )
+
+
+def synthetic_page(seed: int) -> bytes:
+    """Builds a Google-style result page
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the page, equal seeds give equal pages
+
+    Returns
+    -------
+    bytes
+        Raw HTML of the page
+    """
+    rng = random.Random(seed)
+    blocks = [
+        "<div>header</div>",
+        '<div><a href="/search?q=x&amp;tbm=isch">Images</a></div>',
+        "<div>tools</div>",
+    ]
+    if rng.random() < 0.5:
+        blocks.append(featured_snippet(rng))
+    if rng.random() < 0.3:
+        blocks.append(list_block(rng, "Did you mean: ", 1))
+    blocks.append(image_strip(rng))
+
+    result_count = rng.randint(6, 10)
+    for index in range(result_count):
+        blocks.append(organic_result(rng, index))
+        if index == 2:
+            blocks.append(list_block(rng, "People also ask", 4))
+    blocks.append(list_block(rng, "Related searches", 8))
+    blocks += ["<div>Next &gt;</div>", "<div>footer</div>"]
+
+    # the scripts and styles before div#main are skipped by the stream
+    head = (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8"><title>results</title>'
+        + "<style>"
+        + ".a{color:#000}" * 200
+        + "</style><script>"
+        + f"var s='{'x' * rng.randint(4000, 16000)}';"
+        + "</script></head><body><div id=main>"
+    )
+    return (head + "".join(blocks) + "</div></body></html>").encode("utf-8")
+
+
+def synthetic_pages(count: int = 8) -> List[bytes]:
+    """Builds the default benchmark corpus
+
+    Parameters
+    ----------
+    count : int
+        (Optional) Number of pages. (Default=8)
+
+    Returns
+    -------
+    List[bytes]
+        Raw HTML of each page
+    """
+    return [synthetic_page(seed) for seed in range(count)]
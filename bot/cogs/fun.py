@@ -2,10 +2,9 @@ import random
 import time
 from typing import TYPE_CHECKING, Tuple
 
-import aiohttp
 import discord
-import validators
-from discord.ext import commands
+from discord.ext import commands, tasks
+from functions.reddit_pool import RedditPostPool
 
 if TYPE_CHECKING:
     from studybot import StudyBot
@@ -14,8 +13,45 @@ if TYPE_CHECKING:
 class Fun(commands.Cog):
     """Various miscellaneous fun commands"""
 
+    # subreddits to search per command
+    subreddits = {
+        "cat": ("TIGHTPUSSY", "catpictures", "catpics", "IllegallySmolCats"),
+        "dog": ("dogswithjobs", "rarepuppers", "dogpictures", "lookatmydog"),
+        "boobs": ("boobs", "boobies", "bustypetite", "tittydrop"),
+        "dick": ("penis", "cock", "hugedicktinychick", "massivecock"),
+    }
+
     def __init__(self, bot: "StudyBot"):
         self.bot = bot
+        self.post_pool = RedditPostPool(bot)
+
+    async def cog_load(self) -> None:
+        self.refresh_post_pool.start()
+
+    async def cog_unload(self) -> None:
+        self.refresh_post_pool.cancel()
+
+    @tasks.loop(minutes=10)
+    async def refresh_post_pool(self):
+        # Only pools in use and running low are refilled ahead of time,
+        # the rest are refilled on demand by select
+        due = self.post_pool.due(
+            s for subreddits in self.subreddits.values() for s in subreddits
+        )
+        if due:
+            t0 = time.time()
+            with self.bot.metrics.timer("reddit_pool", "refresh"):
+                await self.post_pool.refresh_all(due)
+            self.bot.logger.debug(
+                f"Reddit post pool refreshed {len(due)} subreddits "
+                + f"in {round(time.time()-t0, 5)} sec"
+            )
+
+        # Snapshot sent posts so the 24hr window survives restarts
+        try:
+            self.bot.reddit_sentPosts.save()
+        except OSError as e:
+            self.bot.logger.error(f"Could not save sent Reddit posts: {e}")
 
     @commands.command(
         name="cat",
@@ -27,16 +63,8 @@ class Fun(commands.Cog):
     )
     @commands.cooldown(1, 10, commands.BucketType.default)
     async def cat(self, ctx: commands.Context):
-        # list of subreddits to search
-        urls = (
-            "TIGHTPUSSY",
-            "catpictures",
-            "catpics",
-            "IllegallySmolCats",
-        )
-
         # search handler
-        await self.__random_reddit_post(urls, ctx)
+        await self.__random_reddit_post(self.subreddits["cat"], ctx)
         return
 
     @commands.command(
@@ -48,16 +76,8 @@ class Fun(commands.Cog):
     )
     @commands.cooldown(1, 10, commands.BucketType.default)
     async def dog(self, ctx: commands.Context):
-        # list of subreddits to search
-        urls = (
-            "dogswithjobs",
-            "rarepuppers",
-            "dogpictures",
-            "lookatmydog",
-        )
-
         # search handler
-        await self.__random_reddit_post(urls, ctx)
+        await self.__random_reddit_post(self.subreddits["dog"], ctx)
         return
 
     @commands.command(
@@ -105,16 +125,8 @@ class Fun(commands.Cog):
     @commands.is_nsfw()
     @commands.cooldown(1, 10, commands.BucketType.default)
     async def boobs(self, ctx: commands.Context):
-        # list of subreddits to search
-        urls = (
-            "boobs",
-            "boobies",
-            "bustypetite",
-            "tittydrop",
-        )
-
         # search handler
-        await self.__random_reddit_post(urls, ctx)
+        await self.__random_reddit_post(self.subreddits["boobs"], ctx)
         return
 
     @commands.command(
@@ -126,16 +138,8 @@ class Fun(commands.Cog):
     @commands.is_nsfw()
     @commands.cooldown(1, 10, commands.BucketType.default)
     async def dick(self, ctx: commands.Context):
-        # list of subreddits to search
-        urls = (
-            "penis",
-            "cock",
-            "hugedicktinychick",
-            "massivecock",
-        )
-
         # search handler
-        await self.__random_reddit_post(urls, ctx)
+        await self.__random_reddit_post(self.subreddits["dick"], ctx)
         return
 
     async def __random_reddit_post(
@@ -151,80 +155,52 @@ class Fun(commands.Cog):
             Command context
         """
 
-        # Ensures posts are not repeated within 24hrs
-        self.bot.reddit_sentPosts = {
-            k: v
-            for k, v in self.bot.reddit_sentPosts.items()
-            if time.time() - v < 86400
-        }
-
-        # Queries reddit API
-        msg = await ctx.reply(self.bot.loading_message())
-        img = ""
-        self.bot.logger.debug("Sending API request")
-
-        while img == "":
-            t0 = time.time()
-            url = (
-                "https://www.reddit.com/r/"
-                + subreddit[random.randint(0, len(subreddit) - 1)]
-                + ".json?sort=new&limit=100"
-            )
-
-            session: aiohttp.ClientSession = self.bot.session
-            async with session.get(
-                url, headers={"User-Agent": "studybot/reddit-search"}
-            ) as data:
-                posts = (await data.json())["data"]["children"]
-
-            # Finds random image post, limited to 10 retries
-            self.bot.logger.debug("Getting random post from response")
-            for _ in range(10):
-                try:
-                    img_data: dict = posts[random.randint(0, len(posts) - 1)]["data"]
-                    if (
-                        # is img post
-                        "url_overridden_by_dest" in img_data.keys()
-                        # permitted domains
-                        and any(
-                            url in img_data["url"] for url in ("i.imgur", "i.redd.it")
-                        )
-                        # prev. sent posts
-                        and img_data["id"] not in self.bot.reddit_sentPosts
-                        # valid url
-                        and validators.url(url)
-                    ):
-                        img = img_data["url"]
-                        break
-                except Exception:
-                    continue
+        metrics = self.bot.metrics
+        command = ctx.command.name if ctx.command is not None else "reddit"
+        with metrics.timer(command, "reply"):
+            msg = await ctx.reply(self.bot.loading_message())
+        t0 = time.time()
+
+        # Takes a prefetched post, refilling the pools on demand if empty
+        try:
+            with metrics.timer(command, "fetch"):
+                img_data = await self.post_pool.select(
+                    subreddit, self.bot.reddit_sentPosts
+                )
+        except RedditPostPool.NoPosts:
+            await msg.delete()
+            raise self.bot.UserError("Couldn't find any new posts, try again later")
+        img = img_data.url
 
         self.bot.logger.debug(f"Result found in {round(time.time()-t0, 5)} sec")
 
         # Does not embed gif for compatibility
         if ".gifv" in img:
-            await msg.delete()
-            await ctx.reply(
-                content="https://www.reddit.com/r/"
-                + f"{img_data['subreddit']}/comments/{img_data['id']}"
-                + "\n"
-                + img
-            )
+            with metrics.timer(command, "edit"):
+                await msg.delete()
+                await ctx.reply(
+                    content="https://www.reddit.com/r/"
+                    + f"{img_data.subreddit}/comments/{img_data.id}"
+                    + "\n"
+                    + img
+                )
         else:
             self.bot.logger.debug("Creating Embed")
-            embed = discord.Embed(
-                title=img_data["title"],
-                url="https://www.reddit.com/r/"
-                + f"{img_data['subreddit']}/comments/{img_data['id']}",
-            )
-
-            embed.set_image(url=img)
-            embed.set_footer(text=f"Requested by {ctx.author}")
+            with metrics.timer(command, "embed"):
+                embed = discord.Embed(
+                    title=img_data.title,
+                    url="https://www.reddit.com/r/"
+                    + f"{img_data.subreddit}/comments/{img_data.id}",
+                )
+
+                embed.set_image(url=img)
+                embed.set_footer(text=f"Requested by {ctx.author}")
             self.bot.logger.debug("Sending Embed")
-            await msg.edit(content=None, embed=embed)
+            with metrics.timer(command, "edit"):
+                await msg.edit(content=None, embed=embed)
 
         self.bot.logger.info(f"Sent image: {img}")
-        self.bot.reddit_sentPosts[img_data["id"]] = time.time()
+        self.bot.reddit_sentPosts.add(img_data.id)
         return
 
 
@@ -2,9 +2,8 @@ import random
 from typing import TYPE_CHECKING
 
 import discord
-import pint
 from discord.ext import commands
-from quantulum3 import parser
+from functions.unit_conversion import UnitConverter
 
 if TYPE_CHECKING:
     from studybot import StudyBot
@@ -14,6 +13,12 @@ class OnHandling(commands.Cog):
     def __init__(self, bot: "StudyBot"):
         self.bot = bot
 
+    async def cog_load(self) -> None:
+        # Load the unit registry once, off the event loop
+        self.converter: UnitConverter = await self.bot.executor.run(
+            "units.load", UnitConverter
+        )
+
     @commands.Cog.listener()
     async def on_message(self, message: "discord.Message"):
         if not message.author.bot:
@@ -37,56 +42,31 @@ class OnHandling(commands.Cog):
                         f"<@{message.author.id}> intuit deez nuts"
                     )
 
-            elif any(
-                [
-                    s in message.content.lower()
-                    for s in ("km", "mi", "ft", "cm", "in", "lb", "kg")
-                ]
-            ):
+            elif self.converter.detect(message.content):
                 try:
-                    # Extract quantity from raw text
-                    raw_quant = parser.parse(message.content.lower())
-
-                    # Parse quantity into an object
-                    parsed_quant: pint.Quantity = pint.UnitRegistry()(
-                        raw_quant[0].surface
-                    )
-
-                    # Convert to imperial/metric equivalent
-                    converted_quant = None
-                    match parsed_quant.units:
-                        case "kilometer":
-                            converted_quant = parsed_quant.to("miles")
-                        case "mile":
-                            converted_quant = parsed_quant.to("kilometer")
-                        case "foot":
-                            converted_quant = parsed_quant.to("meter")
-                        case "meter":
-                            converted_quant = parsed_quant.to("foot")
-                        case "inch":
-                            converted_quant = parsed_quant.to("centimeter")
-                        case "centimeter":
-                            converted_quant = parsed_quant.to("inch")
-                        case "pound":
-                            converted_quant = parsed_quant.to("kilogram")
-                        case "kilogram":
-                            converted_quant = parsed_quant.to("pound")
+                    # Extract quantity from raw text and convert to
+                    # imperial/metric equivalent on the worker pool
+                    with self.bot.metrics.timer("unit_conversion", "convert"):
+                        conversion = await self.bot.executor.run(
+                            "units.convert",
+                            self.converter.convert_text,
+                            message.content,
+                        )
 
                     # Send conversion to Discord
-                    if isinstance(converted_quant, pint.Quantity):
-                        u_before = format(parsed_quant, "~P")
-                        u_after = format(round(converted_quant, 2), "~P")
+                    if conversion is not None:
                         embed = discord.Embed(
                             title="Unit Conversion",
-                            description=f"{u_before} is {u_after}",
+                            description=conversion,
                         )
-                        await message.channel.send(embed=embed)
+                        with self.bot.metrics.timer("unit_conversion", "send"):
+                            await message.channel.send(embed=embed)
                 except Exception:
                     pass
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild) -> None:
-        self.logger.info(f"Bot joined guild {guild.name}")
+        self.bot.logger.info(f"Bot joined guild {guild.name}")
         return
 
     @commands.Cog.listener()
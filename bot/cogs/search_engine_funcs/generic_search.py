@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, NamedTuple
 
 from discord.ext import commands
 
@@ -8,6 +9,27 @@ if TYPE_CHECKING:
     from studybot import StudyBot
 
 
+class SearchResult(NamedTuple):
+    """Displayable data of a search result
+
+    Only plain strings are kept, so parsed pages can be freed once
+    results are extracted.
+
+    Attributes
+    ----------
+    description : str | None
+        Text shown in the embed
+    image_url : str
+        Image shown in the embed, empty if none
+    featured : bool
+        True if the result is a featured snippet
+    """
+
+    description: str | None
+    image_url: str = ""
+    featured: bool = False
+
+
 class Search:
     """Internal base class for all search functions
 
@@ -20,6 +42,9 @@ class Search:
     raise asyncio.Timeout when any user-facing timeout expires
     """
 
+    # Searches currently being fetched, shared by identical requests
+    in_flight: Dict[Hashable, asyncio.Task] = {}
+
     def __init__(
         self,
         bot: "StudyBot",
@@ -37,3 +62,36 @@ class Search:
 
     class NoResults(Exception):
         pass
+
+    async def coalesce(self, key: Hashable, fetch: Callable[[], Awaitable]) -> Any:
+        """Runs fetch once for all concurrent callers with the same key
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies equivalent requests (e.g. the search URL)
+        fetch : () -> Awaitable
+            Starts the fetch, only called if no identical fetch is running
+
+        Returns
+        -------
+        Any
+            Result of the shared fetch
+        """
+
+        def done(task: asyncio.Task) -> None:
+            Search.in_flight.pop(key, None)
+            # Retrieve the exception in case every waiter was cancelled
+            if not task.cancelled():
+                task.exception()
+
+        task = Search.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            Search.in_flight[key] = task
+            task.add_done_callback(done)
+        else:
+            self.bot.logger.debug("Joining in-flight search")
+
+        # A cancelled caller must not cancel the fetch for everyone else
+        return await asyncio.shield(task)
@@ -1,19 +1,392 @@
 import asyncio
+import functools
 import re
 import time
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Tuple
+from urllib.parse import quote_plus
 
+import aiohttp
 import cchardet
 import discord
-import validators
-from bs4 import BeautifulSoup, SoupStrainer
-from cogs.search_engine_funcs.generic_search import Search
+from bs4 import BeautifulSoup, NavigableString, Tag
+from cogs.search_engine_funcs.generic_search import Search, SearchResult
 from discord.ext import commands
+from functions.admission import AdmissionController
+from functions.html_stream import HTMLBlockStream
 from functions.multi_page import PageTurnView
 
 if TYPE_CHECKING:
     from studybot import StudyBot
 
+# patterns and filters are compiled once, not per result
+unicode_escape_pattern = re.compile(r"%(.{2})")
+result_link_pattern = re.compile(r"(?<=url\?q=).*(?=&sa)")
+image_link_pattern = re.compile(r"(?<=imgurl=).*(?=&imgrefurl)")
+blank_lines_pattern = re.compile("\n\n+")
+
+# Gx5Zad xpd EtOod pkphOe is Google obsfucation
+featured_snippet_class = "Gx5Zad xpd EtOod pkphOe"
+
+# blocks containing any of these strings are not results
+wrong_first_results = frozenset(
+    {
+        "Did you mean: ",
+        "Showing results for ",
+        "Tip: ",
+        "See results about",
+        "Related searches",
+        "Including results for ",
+        "Top stories",
+        "People also ask",
+        "Next >",
+    }
+)
+
+
+def link_unicode_parse(link: str) -> str:
+    """Parses unicode codes into characters
+
+    :param link: url to parse
+    :type link: str
+    :return: parsed url
+    :rtype: str
+    """
+    return unicode_escape_pattern.sub(lambda m: chr(int(m.group(1), 16)), link)
+
+
+def image_url_parser(image: str) -> str:
+    """Extracts image URL from google url string
+
+    :param image: URL to parse
+    :type image: str
+    :return: Parsed URL
+    :rtype: str
+    """
+    try:
+        # searches html for image urls
+        imgurl = link_unicode_parse(
+            image_link_pattern.search(image.parent.parent["href"]).group()
+        )
+        if "encrypted" in imgurl:
+            imgurl = image_link_pattern.search(
+                image.findAll("img")[1].parent.parent["href"]
+            ).group()
+
+        return imgurl
+    except Exception:
+        return ""
+
+
+class ResultBlock:
+    """Elements of a result block used for extraction
+
+    The block is walked once when created, instead of searching its tree
+    again for every kind of element.
+
+    Parameters
+    ----------
+    block : BeautifulSoup
+        Parsed child of div#main
+
+    Attributes
+    ----------
+    block : BeautifulSoup
+        Parsed child of div#main
+    strings : Tuple[str]
+        Text of the block, as given by block.strings
+    links : List[Tag]
+        Result links that do not wrap an image
+    divs : List[Tag]
+        Divs without nested divs
+    images : List[Tag]
+        All images in the block
+    featured_snippet : Tag | None
+        Featured snippet div, the block itself included
+    """
+
+    __slots__ = ("block", "strings", "links", "divs", "images", "featured_snippet")
+
+    def __init__(self, block: BeautifulSoup) -> None:
+        self.block = block
+        self.featured_snippet = block if self.is_featured(block) else None
+
+        strings = []
+        anchors = []
+        divs = []
+        images = []
+        # ids of elements containing a div or an image, each ancestor is
+        # marked once so the walk stays linear
+        has_div = set()
+        has_image = set()
+        for element in block.descendants:
+            if type(element) is NavigableString:
+                strings.append(element)
+            elif not isinstance(element, Tag):
+                continue
+            elif element.name == "div":
+                divs.append(element)
+                self.mark_ancestors(element, has_div)
+                if self.featured_snippet is None and self.is_featured(element):
+                    self.featured_snippet = element
+            elif element.name == "a":
+                anchors.append(element)
+            elif element.name == "img":
+                images.append(element)
+                self.mark_ancestors(element, has_image)
+
+        self.strings: Tuple[str, ...] = tuple(strings)
+        self.links = [a for a in anchors if id(a) not in has_image]
+        self.divs = [d for d in divs if id(d) not in has_div]
+        self.images = images
+
+    def mark_ancestors(self, element: Tag, marked: set) -> None:
+        parent = element.parent
+        while parent is not self.block and id(parent) not in marked:
+            marked.add(id(parent))
+            parent = parent.parent
+
+    @staticmethod
+    def is_featured(element: Tag) -> bool:
+        return " ".join(element.get("class", ())) == featured_snippet_class
+
+
+def text_result(result: ResultBlock) -> SearchResult:
+    """Extracts displayable data from a Google result
+
+    :param result: Scanned result block
+    :type result: ResultBlock
+    :return: Result description and image URL
+    :rtype: SearchResult
+    """
+
+    # google results are separated by divs
+    # searches for link in div
+    link = None
+    if len(result.links) != 0:
+        try:
+            # parses link from html
+            link = link_unicode_parse(
+                result_link_pattern.search(result.links[0]["href"]).group()
+            )
+        except Exception:
+            pass
+
+    # extracts all meaningful text in the search result by div
+    divs = result.divs
+    titleinfo = [
+        " ".join(
+            [string if string != "View all" else "" for string in div.stripped_strings]
+        )
+        for div in divs[:2]
+    ]
+    titleinfo = [f"**{ti}**" for ti in titleinfo if ti != ""]
+    if link is not None:
+        titleinfo[-1] = link
+
+    lines = [
+        " ".join(
+            [string if string != "View all" else "" for string in div.stripped_strings]
+        )
+        for div in divs[2:]
+    ]
+
+    printstring = "\n".join(titleinfo + lines)
+
+    # discord prevents embeds longer than 2048 chars
+    # truncates adds ellipses to strings longer than 2048 chars
+    if len(printstring) > 1024:
+        printstring = printstring[:1020] + "..."
+
+    # tries to find an image for the result
+    return SearchResult(
+        description=blank_lines_pattern.sub("\n\n", printstring),
+        image_url=image_url_parser(result.images[0] if result.images else None),
+    )
+
+
+def featured_snippet_result(result: BeautifulSoup) -> SearchResult:
+    """Extracts displayable data from a Google Featured Snippet
+
+    :param result: Raw HTML from BeautifulSoup
+    :type result: BeautifulSoup
+    :return: Snippet description
+    :rtype: SearchResult
+    """
+
+    # extracts all meaningful text in the search result by div
+    printstring = "\n".join(
+        [
+            "\n".join(
+                [
+                    string if string != "View all" else ""
+                    for string in tuple(div.stripped_strings)[:2]
+                ]
+            )
+            for div in result
+        ]
+    )
+
+    # discord prevents embeds longer than 2048 chars
+    # truncates adds ellipses to strings longer than 2048 chars
+    if len(printstring) > 1024:
+        printstring = printstring[:1020] + "..."
+
+    return SearchResult(
+        description=blank_lines_pattern.sub("\n\n", printstring), featured=True
+    )
+
+
+def result_embed(result: SearchResult, query: str, url: str) -> discord.Embed:
+    """Generates Discord Embed from extracted result data
+
+    :param result: Output of text_result, featured_snippet_result
+        or image_result
+    :type result: SearchResult
+    :param query: Search query of the user
+    :type query: str
+    :param url: Google search URL
+    :type url: str
+    :return: Discord Embed
+    :rtype: discord.Embed
+    """
+    # titles are built per search, as results are shared between
+    # equivalent queries
+    if result.featured:
+        title = (
+            "[BETA] Featured Snippet: "
+            + f'{query[:220]}{"..." if len(query) > 220 else ""}'
+        )
+    else:
+        title = (
+            "Search results for: " + f'{query[:233]}{"..." if len(query) > 233 else ""}'
+        )
+
+    embed = discord.Embed(title=title, description=result.description)
+    if result.image_url:
+        embed.set_image(url=result.image_url)
+    embed.url = url
+    return embed
+
+
+def parse_block(block: str) -> ResultBlock:
+    """Parses a result block streamed from the page
+
+    :param block: HTML of a direct child of div#main
+    :type block: str
+    :return: Parsed and scanned block
+    :rtype: ResultBlock
+    """
+    soup = BeautifulSoup(block, features="lxml")
+    return ResultBlock(soup.body.contents[0] if soup.body is not None else soup)
+
+
+def result_cleanup(blocks: List[ResultBlock]) -> List[ResultBlock]:
+    """Filters HTML result for easier processing
+
+    :param blocks: Parsed children of div#main
+    :type blocks: List[ResultBlock]
+    :return: Filtered HTML
+    :rtype: list
+    """
+    # html div cleanup
+    results = blocks[3 : len(blocks) - 2]
+
+    # bad div filtering
+    return [
+        result for result in results if wrong_first_results.isdisjoint(result.strings)
+    ]
+
+
+def text_results(
+    blocks: List[ResultBlock], filtered_results: List[ResultBlock]
+) -> List[SearchResult]:
+    """Extracts data for text results
+
+    :param blocks: Parsed children of div#main
+    :type blocks: List[ResultBlock]
+    :param filtered_results: Results from result_cleanup
+    :type filtered_results: List[ResultBlock]
+    :return: Result data, led by the featured snippet if present
+    :rtype: List[SearchResult]
+    """
+    # Remove featured snippet from result
+    for idx, val in enumerate(filtered_results):
+        if "Featured Snippets" in "".join(val.strings):
+            filtered_results.pop(idx)
+            break
+
+    # Creates result list
+    results = [
+        result for result in map(text_result, filtered_results) if result.description
+    ]
+
+    # Add featured snippet to beginning
+    for block in blocks:
+        if block.featured_snippet is not None:
+            results.insert(0, featured_snippet_result(block.featured_snippet))
+            break
+    return results
+
+
+def first_text_result(block: ResultBlock) -> SearchResult | None:
+    """Extracts a text result shown before the page finishes downloading
+
+    :param block: Scanned block, not among the first 3 or last 2 of the page
+    :type block: ResultBlock
+    :return: Result data, None if text_results would not keep the block
+    :rtype: SearchResult | None
+    """
+    if not wrong_first_results.isdisjoint(block.strings):
+        return None
+    if "Featured Snippets" in "".join(block.strings):
+        return None
+    result = text_result(block)
+    return result if result.description else None
+
+
+def image_result(image: BeautifulSoup) -> SearchResult:
+    """Extracts displayable data from google image result
+
+    :param image: Raw HTML from BeautifulSoup
+    :type image: BeautifulSoup
+    :return: Result image URL
+    :rtype: SearchResult
+    """
+    try:
+        image_url = image_url_parser(image)
+    except Exception:
+        image_url = (
+            "https://external-preview.redd.it/"
+            + "9HZBYcvaOEnh4tOp5EqgcCr_vKH7cjFJwkvw-45Dfjs.png?"
+            + "auto=webp&s=ade9b43592942905a45d04dbc5065badb5aa3483"
+        )
+    return SearchResult(description=None, image_url=image_url)
+
+
+def free_blocks(blocks: List[ResultBlock]) -> None:
+    """Breaks up parsed blocks so they are freed without the cyclic GC
+
+    :param blocks: Parsed children of div#main
+    :type blocks: List[ResultBlock]
+    """
+    for block in blocks:
+        block.block.decompose()
+
+
+def image_results(filtered_results: List[ResultBlock]) -> List[SearchResult]:
+    """Extracts image results, not yet checked to embed properly
+
+    :param filtered_results: Results from result_cleanup
+    :type filtered_results: List[ResultBlock]
+    :return: Image result data
+    :rtype: List[SearchResult]
+    """
+    # searches for the "images for" search result div
+    for result in filtered_results:
+        if "Images" in result.strings:
+            return list(map(image_result, result.images))
+    return []
+
 
 class GoogleSearch(Search):
     def __init__(
@@ -27,17 +400,18 @@ class GoogleSearch(Search):
         super().__init__(bot, ctx, message, args, query)
 
         # creates google search url
+        # query is normalised so equivalent searches share a cache entry
         # https://google.com/search?
         #   q=[query]
         #   &num=[number of results]
         #   &safe=[safesearch status]
         #   &pws=0
 
-        rm_img = "+-stock+-pinterest" if bool(re.search("image", query.lower())) else ""
+        rm_img = "+-stock+-pinterest" if "image" in query.lower() else ""
         self.url = "".join(
             [
                 "https://google.com/search?pws=0&q=",
-                self.query.replace(" ", "+"),
+                quote_plus(" ".join(self.query.lower().split())),
                 f"{rm_img}",
                 "&safe=active",
                 "&uule=w+CAIQICI5TW91bnRhaW4gVmlldyxTYW50YS",
@@ -47,379 +421,375 @@ class GoogleSearch(Search):
         )
         return
 
-    async def __call__(self) -> None:
-        """Performs Google search
+    async def fetch_blocks(
+        self,
+        has_found_image: bool,
+        on_first_result: Callable[[SearchResult], None] | None = None,
+    ) -> Tuple[HTMLBlockStream, List[ResultBlock]]:
+        """Streams the Google results page, parsing blocks as they arrive
+
+        Parameters
+        ----------
+        has_found_image : bool
+            True if the user searched for images
+        on_first_result : (SearchResult) -> None
+            (Optional) Called with the first text result while the rest of
+            the page downloads. (Default=None)
+
+        Returns
+        -------
+        Tuple[HTMLBlockStream, List[ResultBlock]]
+            Finished stream and the parsed children of div#main
 
         Raises
         ----------
-        Search.NoResults : when no results are found
-        asyncio.TimeoutError : when any interaction expires
+        asyncio.TimeoutError, aiohttp.ClientError : when the download fails
         """
-
-        def link_unicode_parse(link: str) -> str:
-            """Parses unicode codes into characters
-
-            :param link: url to parse
-            :type link: str
-            :return: parsed url
-            :rtype: str
-            """
-            return re.sub(r"%(.{2})", lambda m: chr(int(m.group(1), 16)), link)
-
-        def image_url_parser(image: str) -> str:
-            """Extracts image URL from google url string
-
-            :param image: URL to parse
-            :type image: str
-            :return: Parsed URL
-            :rtype: str
-            """
-            try:
-                # searches html for image urls
-                imgurl = link_unicode_parse(
-                    re.findall(
-                        "(?<=imgurl=).*(?=&imgrefurl)", image.parent.parent["href"]
-                    )[0]
-                )
-                if "encrypted" in imgurl:
-                    imgurl = re.findall(
-                        "(?<=imgurl=).*(?=&imgrefurl)",
-                        image.findAll("img")[1].parent.parent["href"],
-                    )[0]
-
-                return imgurl
-            except Exception:
-                return ""
-
-        def text_embed(result: BeautifulSoup) -> discord.Embed:
-            """Generates Discord Embed for Google result
-
-            :param result: Raw HTML from BeautifulSoup
-            :type result: BeautifulSoup
-            :return: Discord Embed
-            :rtype: discord.Embed
-            """
-            # creates and formats the embed
-
-            result_embed = discord.Embed(
-                title=(
-                    "Search results for: "
-                    + f'{self.query[:233]}{"..." if len(self.query) > 233 else ""}'
+        metrics = self.bot.metrics
+        parse_tasks: List[asyncio.Task] = []
+        try:
+            with metrics.timer("google", "fetch"):
+                async with self.bot.web.get(
+                    "google", self.url, headers={"User-Agent": "python-requests/2.25.1"}
+                ) as data:
+                    # result blocks are parsed while the rest of the page downloads
+                    stream = HTMLBlockStream("main", encoding=data.charset)
+                    # the first 3 and last 2 blocks are never results, so a
+                    # block is a candidate once 2 more blocks follow it
+                    candidate = 3
+                    async for chunk in data.content.iter_chunked(16384):
+                        parse_tasks.extend(
+                            asyncio.create_task(
+                                self.bot.executor.run(
+                                    "google.parse", parse_block, block
+                                )
+                            )
+                            for block in stream.feed(chunk)
+                        )
+                        while (
+                            on_first_result is not None
+                            and not has_found_image
+                            and candidate + 2 < len(parse_tasks)
+                            and parse_tasks[candidate].done()
+                        ):
+                            result = await self.bot.executor.run(
+                                "google.extract",
+                                first_text_result,
+                                parse_tasks[candidate].result(),
+                            )
+                            candidate += 1
+                            if result is not None:
+                                on_first_result(result)
+                                on_first_result = None
+
+            with metrics.timer("google", "parse"):
+                parse_tasks.extend(
+                    asyncio.create_task(
+                        self.bot.executor.run("google.parse", parse_block, block)
+                    )
+                    for block in stream.close()
                 )
+                return stream, list(await asyncio.gather(*parse_tasks))
+
+        except BaseException:
+            # blocks of a page that failed are not needed, and failed parses
+            # are marked retrieved so they are not logged as unhandled
+            for task in parse_tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+            raise
+
+    async def search_results(
+        self,
+        has_found_image: bool,
+        on_first_result: Callable[[SearchResult], None] | None = None,
+    ) -> List[SearchResult]:
+        """Fetches and parses the Google results page
+
+        Parameters
+        ----------
+        has_found_image : bool
+            True if the user searched for images
+        on_first_result : (SearchResult) -> None
+            (Optional) Called with the first text result while the rest of
+            the page downloads. (Default=None)
+
+        Returns
+        -------
+        List[SearchResult]
+            Extracted result data, also stored in the search cache. Image
+            results are not yet checked to embed properly
+
+        Raises
+        ----------
+        Search.NoResults : when the page has no results
+        UserError : when Google times out or cannot be reached
+        """
+        # gets the webscraped html of the google search
+        self.bot.logger.debug("Retrieving google html")
+        metrics = self.bot.metrics
+        with metrics.timer("google", "ratelimit"):
+            await self.bot.google_limiter.acquire()
+
+        try:
+            stream, blocks = await self.fetch_blocks(has_found_image, on_first_result)
+        except asyncio.TimeoutError:
+            self.bot.logger.info("Google search timed out")
+            raise self.bot.UserError("Google took too long to respond, try again")
+        except aiohttp.ClientError as e:
+            self.bot.logger.info(f"Could not reach Google: {e}")
+            raise self.bot.UserError("Could not reach Google, try again shortly")
+
+        # remove cchardet import error
+        _ = cchardet
+
+        # if the search returns results
+        if not stream.found:
+            self.bot.logger.debug("Search returned 0 results")
+            raise Search.NoResults
+        self.bot.logger.debug("Cleaning results")
+        with metrics.timer("google", "cleanup"):
+            filtered_results = await self.bot.executor.run(
+                "google.cleanup", result_cleanup, blocks
             )
 
-            # google results are separated by divs
-            # searches for link in div
-            find_link = result.find_all("a", href_="")
-            link_list = tuple(a for a in find_link if not a.find("img"))
-            link = None
-            if len(link_list) != 0:
-                try:
-                    # parses link from html
-                    link = link_unicode_parse(
-                        re.findall(r"(?<=url\?q=).*(?=&sa)", link_list[0]["href"])[0]
-                    )
-                except Exception:
-                    pass
-
-            # extracts all meaningful text in the search result by div
-            result_find = result.findAll("div")
-            divs = tuple(d for d in result_find if not d.find("div"))
-            titleinfo = [
-                " ".join(
-                    [
-                        string if string != "View all" else ""
-                        for string in div.stripped_strings
-                    ]
+        # checks if user searched specifically for images, else use text embed
+        if has_found_image:
+            self.bot.logger.debug("User searched for images, parsing image results")
+            with metrics.timer("google", "extract"):
+                results = await self.bot.executor.run(
+                    "google.extract", image_results, filtered_results
                 )
-                for div in divs[:2]
-            ]
-            titleinfo = [f"**{ti}**" for ti in titleinfo if ti != ""]
-            if link is not None:
-                titleinfo[-1] = link
-
-            lines = [
-                " ".join(
-                    [
-                        string if string != "View all" else ""
-                        for string in div.stripped_strings
-                    ]
+        else:
+            self.bot.logger.debug("Parsing text results")
+            with metrics.timer("google", "extract"):
+                results = await self.bot.executor.run(
+                    "google.extract", text_results, blocks, filtered_results
                 )
-                for div in divs[2:]
-            ]
 
-            printstring = "\n".join(titleinfo + lines)
-
-            # discord prevents embeds longer than 2048 chars
-            # truncates adds ellipses to strings longer than 2048 chars
-            if len(printstring) > 1024:
-                printstring = printstring[:1020] + "..."
-
-            # sets embed description to string
-            result_embed.description = re.sub("\n\n+", "\n\n", printstring)
-
-            # tries to add an image to the embed
-            image = result.find("img")
-            try:
-                result_embed.set_image(url=image_url_parser(image))
-            except Exception:
-                pass
-            result_embed.url = self.url
-            return result_embed
-
-        def featured_snippet_embed(result: BeautifulSoup) -> discord.Embed:
-            """Generates Discord Embed for Google Featured Snippet
-
-            :param result: Raw HTML from BeautifulSoup
-            :type result: BeautifulSoup
-            :return: Discord Embed
-            :rtype: discord.Embed
-            """
-            # creates and formats the embed
-
-            result_embed = discord.Embed(
-                title=(
-                    "[BETA] Featured Snippet: "
-                    + f'{self.query[:220]}{"..." if len(self.query) > 220 else ""}'
-                )
+        # results only hold strings, so the parsed page can be freed now
+        # rather than paused for by the cyclic garbage collector
+        await self.bot.executor.run("google.free", free_blocks, blocks)
+
+        if results:
+            self.bot.search_cache.set(self.url, results)
+        return results
+
+    async def admitted_search(
+        self,
+        has_found_image: bool,
+        on_first_result: Callable[[SearchResult], None] | None = None,
+    ) -> List[SearchResult]:
+        """Runs search_results once the user and guild have a free slot
+
+        Raises
+        ----------
+        UserError : when too many searches are queued
+        """
+        guild_id = self.ctx.guild.id if self.ctx.guild is not None else None
+        try:
+            async with self.bot.search_admission.admit(self.ctx.author.id, guild_id):
+                return await self.search_results(has_found_image, on_first_result)
+        except AdmissionController.QueueFull:
+            self.bot.logger.info("Search queue full, rejecting search")
+            raise self.bot.UserError(
+                "Too many searches are running right now, try again shortly"
             )
 
-            # extracts all meaningful text in the search result by div
-            printstring = "\n".join(
-                [
-                    "\n".join(
-                        [
-                            string if string != "View all" else ""
-                            for string in tuple(div.stripped_strings)[:2]
-                        ]
-                    )
-                    for div in result
-                ]
+    def result_page(
+        self, results: List[SearchResult], index: int, complete: bool = True
+    ) -> discord.Embed:
+        """Renders a page of results, called by PageTurnView on first view
+
+        Parameters
+        ----------
+        results : List[SearchResult]
+            Results shown, may still be growing
+        index : int
+            Page index
+        complete : bool
+            (Optional) False while the page count is not yet known.
+            (Default=True)
+
+        Returns
+        -------
+        discord.Embed
+            Discord embed with page numbering footer
+        """
+        return result_embed(results[index], self.query, self.url).set_footer(
+            text=(
+                "Page "
+                + f"{index+1}/{len(results) if complete else '...'}"
+                + "\nRequested by: "
+                + f"{str(self.ctx.author)}"
             )
+        )
 
-            # discord prevents embeds longer than 2048 chars
-            # truncates adds ellipses to strings longer than 2048 chars
-            if len(printstring) > 1024:
-                printstring = printstring[:1020] + "..."
-
-            # sets embed description to string
-            result_embed.description = re.sub("\n\n+", "\n\n", printstring)
-            result_embed.url = self.url
-            return result_embed
-
-        def result_cleanup(soup: BeautifulSoup) -> List[BeautifulSoup]:
-            """Filters HTML result for easier processing
-
-            :param result: Raw HTML
-            :type result: BeautifulSoup
-            :return: Filtered HTML
-            :rtype: list
-            """
-            # html div cleanup
-            results = soup.find("div", {"id": "main"}).contents
-            results = [
-                results[resultNumber] for resultNumber in range(3, len(results) - 2)
-            ]
+    async def valid_images(
+        self, results: List[SearchResult]
+    ) -> AsyncIterator[SearchResult]:
+        """Yields image results as soon as each is checked to embed properly
 
-            # bad divs to discard
-            wrong_first_results = {
-                "Did you mean: ",
-                "Showing results for ",
-                "Tip: ",
-                "See results about",
-                "Related searches",
-                "Including results for ",
-                "Top stories",
-                "People also ask",
-                "Next >",
-            }
-            # bad div filtering
-            return [
-                result
-                for result in results
-                if not any(
-                    badResult in result.strings for badResult in wrong_first_results
-                )
-                or result.strings == ""
-            ]
+        Parameters
+        ----------
+        results : List[SearchResult]
+            Image results from search_results
 
-        async def image_results(results: set) -> List[discord.Embed]:
-            """Finds images from results
-
-            Parameters
-            ----------
-            results : set
-                set of BeautifulSoup parsed HTML results
-
-            Returns
-            -------
-            List[discord.Embed]
-                List of image embeds
-            """
-
-            def image_embed(image: BeautifulSoup) -> discord.Embed:
-                """Generates Discord Embed from google result
-
-                :param image: Raw HTML from BeautifulSoup
-                :type image: BeautifulSoup
-                :return: Discord embed of image
-                :rtype: discord.Embed
-                """
-                try:
-                    # creates and formats the embed
-                    result_embed = discord.Embed(
-                        title=f"Search results for: {self.query[:233]}"
-                        f'{"..." if len(self.query) > 233 else ""}'
-                    )
+        Yields
+        ------
+        SearchResult
+            Image result data, in the order checks complete
+        """
 
-                    # sets the discord embed to the image
-                    result_embed.set_image(url=image_url_parser(image))
-                    result_embed.url = self.url
-                except Exception:
-                    result_embed.set_image(
-                        url=(
-                            "https://external-preview.redd.it/"
-                            + "9HZBYcvaOEnh4tOp5EqgcCr_vKH7cjFJwkvw-45Dfjs.png?"
-                            + "auto=webp&s=ade9b43592942905a45d04dbc5065badb5aa3483"
-                        )
-                    )
-                finally:
-                    return result_embed
-
-            async def url_validation(url: str) -> bool:
-                """Validates if provided URL links to an image
-
-                Parameters
-                ----------
-                url : str
-                    Unparsed URL of image
-
-                Returns
-                -------
-                bool
-                    True if valid URL
-                """
-                try:
-                    url = image_url_parser(url)
-                    async with self.bot.session.head(
-                        url, allow_redirects=False
-                    ) as resp:
-                        return resp.status < 300 and validators.url(url)
-                except Exception:
-                    return False
-
-            # searches for the "images for" search result div
-            for result in results:
-                if "Images" in result.strings:
-                    images = result.findAll("img", recursive=True)
-                    tasks = [asyncio.create_task(url_validation(url)) for url in images]
-                    # checks if image wont embed properly
-                    good_url_mask = await asyncio.gather(*tasks)
-                    images = [
-                        i for (i, v) in zip([url for url in images], good_url_mask) if v
-                    ]
-
-                    # creates embed list
-                    embeds = [
-                        embed
-                        for embed in list(map(image_embed, images))
-                        if embed.description is not (None or "")
-                    ]
-
-                    return embeds
+        async def checked(result: SearchResult) -> Tuple[SearchResult, bool]:
+            return result, await self.bot.image_validator.validate(result.image_url)
 
-        try:
-            t0 = time.time()
+        for next_checked in asyncio.as_completed(map(checked, results)):
+            result, is_valid = await next_checked
+            if is_valid:
+                yield result
 
-            # checks if image is in search query
-            self.bot.logger.debug("Checking if user searched for image")
-            if bool(re.search("image", self.query.lower())):
-                has_found_image = True
-            else:
-                has_found_image = False
+    async def show(self, view: PageTurnView) -> None:
+        """Replaces the loading message with the first page of a view
 
-            # gets the webscraped html of the google search
-            self.bot.logger.debug("Retrieving google html")
-            async with self.bot.session.get(
-                self.url, headers={"User-Agent": "python-requests/2.25.1"}
-            ) as data:
-                html = await data.text()
-                soup = BeautifulSoup(
-                    html,
-                    features="lxml",
-                    parse_only=SoupStrainer("div", {"id": "main"}),
-                )
+        Parameters
+        ----------
+        view : PageTurnView
+            View of the results
+        """
+        with self.bot.metrics.timer("google", "embed"):
+            first_page = view.get_page(0)
+        with self.bot.metrics.timer("google", "edit"):
+            await self.message.edit(
+                content="",
+                embed=first_page,
+                view=view,
+            )
 
-            # remove cchardet import error
-            _ = cchardet
+    async def show_images(self, results: List[SearchResult]) -> PageTurnView:
+        """Shows the first valid image immediately, adding the rest as pages
 
-            # Debug HTML output
-            # with open("test.html", "w", encoding="utf-8-sig") as file:
-            #     file.write(soup.prettify())
+        Parameters
+        ----------
+        results : List[SearchResult]
+            Image results from search_results
 
-            # if the search returns results
-            if soup.find("div", {"id": "main"}) is None:
-                self.bot.logger.debug("Search returned 0 results")
-                raise Search.NoResults
-            embeds = []
-            self.bot.logger.debug("Cleaning results")
-            filtered_results = result_cleanup(soup)
+        Returns
+        -------
+        PageTurnView
+            View of the valid images
 
-            # checks if user searched specifically for images, else use text embed
-            if has_found_image:
-                self.bot.logger.debug("User searched for images, parsing image results")
-                embeds = await image_results(filtered_results)
+        Raises
+        ----------
+        Search.NoResults : when no image is valid
+        """
+        shown = []
+        view = None
+        async for result in self.valid_images(results):
+            shown.append(result)
+            page = functools.partial(self.result_page, shown, len(shown) - 1)
+            if view is None:
+                view = PageTurnView(self.bot, self.ctx, [page], self.message, 60)
+                await self.show(view)
             else:
-                self.bot.logger.debug("Parsing text results")
-
-                # Remove featured snippet from result
-                for idx, val in enumerate(filtered_results):
-                    if "Featured Snippets" in val.text:
-                        filtered_results.pop(idx)
-                        break
-
-                # Creates embed list
-                embeds = [
-                    embed
-                    for embed in map(text_embed, filtered_results)
-                    if embed.description is not (None or "")
-                ]
+                view.add_page(page)
 
-                # Add featured snippet to beginning
-                # Gx5Zad xpd EtOod pkphOe is Google obsfucation
-                featured_snippet = soup.find(
-                    "div", {"class": "Gx5Zad xpd EtOod pkphOe"}
-                )
-                if featured_snippet is not None:
-                    embeds.insert(0, featured_snippet_embed(featured_snippet))
+        if view is None:
+            raise Search.NoResults
 
-            if embeds is None or len(embeds) == 0:
-                raise Search.NoResults
+        # updates the page count of the page shown
+        if len(shown) > 1:
+            await view.refresh()
+        return view
+
+    async def stop_preview(
+        self, preview: List[Tuple[SearchResult, PageTurnView, asyncio.Task]]
+    ) -> None:
+        """Stops the view of a first result shown before the search failed
+
+        Parameters
+        ----------
+        preview : List[Tuple[SearchResult, PageTurnView, asyncio.Task]]
+            First result, its view and the task showing it
+        """
+        for _, view, shown in preview:
+            await asyncio.gather(shown, return_exceptions=True)
+            view.stop()
+
+    async def __call__(self) -> None:
+        """Performs Google search
+
+        Raises
+        ----------
+        Search.NoResults : when no results are found
+        UserError : when too many searches are queued or Google fails
+        asyncio.TimeoutError : when any interaction expires
+        """
+        # the first text result is shown while the page downloads, in a view
+        # given every page once the search finishes
+        preview: List[Tuple[SearchResult, PageTurnView, asyncio.Task]] = []
+
+        def show_first_result(result: SearchResult) -> None:
+            page = functools.partial(self.result_page, [result], 0, False)
+            view = PageTurnView(self.bot, self.ctx, [page], self.message, 60)
+            preview.append((result, view, asyncio.create_task(self.show(view))))
+
+        try:
+            t0 = time.time()
+
+            # checks if image is in search query
+            self.bot.logger.debug("Checking if user searched for image")
+            if "image" in self.query.lower():
+                has_found_image = True
+            else:
+                has_found_image = False
 
-            # adds the page numbering footer to the embeds
-            embeds = [
-                e.set_footer(
-                    text=(
-                        "Page "
-                        + f"{i+1}/{len(embeds)}"
-                        + "\nRequested by: "
-                        + f"{str(self.ctx.author)}"
+            # reuses parsed results of recent identical searches, and shares
+            # the fetch of identical searches that are still running
+            with self.bot.metrics.timer("google", "search"):
+                results = self.bot.search_cache.get(self.url)
+                if results is None:
+                    results = await self.coalesce(
+                        self.url,
+                        lambda: self.admitted_search(
+                            has_found_image, show_first_result
+                        ),
                     )
-                )
-                for i, e in enumerate(embeds)
-            ]
+                else:
+                    self.bot.logger.debug("Using cached search results")
+
+            if not results:
+                raise Search.NoResults
 
             self.bot.logger.debug(
-                f"Search returned {len(embeds)} "
+                f"Search returned {len(results)} "
                 + f"results in {round(time.time()-t0, 5)} sec"
             )
 
-            view = PageTurnView(self.bot, self.ctx, embeds, self.message, 60)
-            await self.message.edit(
-                content="",
-                embed=embeds[0],
-                view=view,
-            )
+            if has_found_image:
+                # each image is shown as soon as it is checked, instead of
+                # waiting for the slowest image host
+                view = await self.show_images(results)
+            else:
+                pages = [
+                    functools.partial(self.result_page, results, i)
+                    for i in range(len(results))
+                ]
+                if preview:
+                    # keeps the result shown in place, in case a featured
+                    # snippet was found before it
+                    first_result, view, shown = preview[0]
+                    await shown
+                    view.set_pages(
+                        pages,
+                        results.index(first_result) if first_result in results else 0,
+                    )
+                    await view.refresh()
+                else:
+                    view = PageTurnView(self.bot, self.ctx, pages, self.message, 60)
+                    await self.show(view)
 
             await view.wait()
             raise asyncio.TimeoutError
@@ -427,7 +797,13 @@ class GoogleSearch(Search):
         except (asyncio.TimeoutError, Search.NoResults):
             raise
 
+        except self.bot.UserError:
+            # the error replaces the first result, if it was shown
+            await self.stop_preview(preview)
+            raise
+
         except Exception as e:
+            await self.stop_preview(preview)
             await self.message.delete()
             await self.bot.on_command_error(self.ctx, e)
             raise e
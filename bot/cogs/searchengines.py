@@ -1,13 +1,12 @@
 import asyncio
 from typing import TYPE_CHECKING, List
 
+import discord
 from cogs.search_engine_funcs.generic_search import Search
 from cogs.search_engine_funcs.google import GoogleSearch
 from discord.ext import commands
 
 if TYPE_CHECKING:
-    import discord
-
     from studybot import StudyBot
 
 
@@ -27,7 +26,7 @@ class SearchEngines(commands.Cog):
         ),
         aliases=["g", "googel", "googlr", "googl", "gogle", "gogl", "foogle"],
     )
-    @commands.cooldown(1, 3, commands.BucketType.default)
+    @commands.cooldown(1, 3, commands.BucketType.user)
     async def google(self, ctx: commands.Context, *args):
         await self.__genericSearch__(ctx, GoogleSearch, args)
         return
@@ -103,10 +102,13 @@ class SearchEngines(commands.Cog):
                     )(),
                     name="finished_interaction",
                 )
+                # raw edits are received even if the message left the cache,
+                # updates without content (e.g. link embeds) are ignored
                 message_edit = asyncio.create_task(
                     self.bot.wait_for(
-                        "message_edit",
-                        check=lambda _, m: m.author == ctx.author and m == ctx.message,
+                        "raw_message_edit",
+                        check=lambda p: p.message_id == ctx.message.id
+                        and "content" in p.data,
                         timeout=30,
                     ),
                     name="message_edited",
@@ -121,16 +123,23 @@ class SearchEngines(commands.Cog):
                     if isinstance(t.exception(), Exception):
                         for task in waiting:
                             task.cancel()
-                            return
+                        # errors caused by the user replace the loading message
+                        if isinstance(t.exception(), self.bot.UserError):
+                            await message.edit(
+                                content="",
+                                embed=discord.Embed(description=t.exception().reason),
+                                view=None,
+                            )
+                        return
 
                 # Checks if user edited message
                 if message_edit in done:
                     self.bot.logger.debug("Message edit detected, looping search")
                     await message.delete()
 
-                    userquery = message_edit.result()[1].content.replace(
-                        f"&{ctx.invoked_with} ", ""
-                    )  # finds the new user query
+                    # finds the new user query
+                    edited = message_edit.result().data["content"]
+                    userquery = edited.replace(f"&{ctx.invoked_with} ", "")
                     message = await ctx.reply(self.bot.loading_message())
                     continue
 
@@ -28,6 +28,150 @@ class Utilities(commands.Cog):
             pass
         await ctx.reply(f"Reloaded ```{success_cog}```")
 
+    @commands.command(name="unitstats", hidden=True)
+    @commands.is_owner()
+    async def unitstats(self, ctx: commands.Context):
+        converter = self.bot.get_cog("OnHandling").converter
+        total = converter.accepted + converter.rejected
+        rejected_pct = round(converter.rejected / total * 100, 2) if total else 0.0
+        cache = converter.cache_info()
+        await ctx.reply(
+            embed=discord.Embed(
+                title="Unit Conversion",
+                description=f"Messages checked: {total}"
+                + "\n"
+                + f"Accepted: {converter.accepted}"
+                + "\n"
+                + f"Rejected: {converter.rejected} ({rejected_pct}%)"
+                + "\n"
+                + f"Cache hits: {cache.hits}, misses: {cache.misses}",
+            )
+        )
+
+    @commands.command(name="workerstats", hidden=True)
+    @commands.is_owner()
+    async def workerstats(self, ctx: commands.Context):
+        executor = self.bot.executor
+        lines = [
+            f"Workers: {executor.max_workers}, "
+            + f"pending: {executor.pending}/{executor.max_workers + executor.max_queue}"
+        ]
+        for stage, timing in sorted(executor.timings.items()):
+            lines.append(
+                f"`{stage}`: {timing.count} runs, "
+                + f"mean {round(timing.mean*1000, 2)} ms, "
+                + f"max {round(timing.max*1000, 2)} ms"
+            )
+        await ctx.reply(
+            embed=discord.Embed(title="Worker Pool", description="\n".join(lines))
+        )
+
+    @commands.command(name="logstats", hidden=True)
+    @commands.is_owner()
+    async def logstats(self, ctx: commands.Context):
+        await ctx.reply(
+            embed=discord.Embed(
+                title="Logging",
+                description=f"Queued records: {self.bot.log_queue.depth}"
+                + "\n"
+                + f"Dropped records: {self.bot.log_queue.dropped}",
+            )
+        )
+
+    @commands.command(name="imagestats", hidden=True)
+    @commands.is_owner()
+    async def imagestats(self, ctx: commands.Context):
+        validator = self.bot.image_validator
+        await ctx.reply(
+            embed=discord.Embed(
+                title="Image Validation",
+                description=f"Cached valid: {len(validator.valid)}, "
+                + f"invalid: {len(validator.invalid)}"
+                + "\n"
+                + f"Cache hits: {validator.valid.hits + validator.invalid.hits}"
+                + "\n"
+                + f"HEAD requests: {validator.requests}, "
+                + f"timed out: {validator.timeouts}"
+                + "\n"
+                + f"Slow hosts: {len(validator.slow_hosts)}",
+            )
+        )
+
+    @commands.command(name="httpstats", hidden=True)
+    @commands.is_owner()
+    async def httpstats(self, ctx: commands.Context):
+        web = self.bot.web
+        lines = []
+        for name, (limit, limit_per_host) in web.pools.items():
+            stats = web.stats[name]
+            lines.append(
+                f"`{name}` ({limit} conns, {limit_per_host}/host): "
+                + f"{stats.active} active, peak {stats.peak}, "
+                + f"{stats.requests} requests, {stats.errors} errors, "
+                + f"{stats.timeouts} timeouts"
+            )
+        lines.append(f"Sessions draining: {len(web.retired)}")
+        await ctx.reply(
+            embed=discord.Embed(title="HTTP Pools", description="\n".join(lines))
+        )
+
+    @commands.command(name="shardstats", hidden=True)
+    @commands.is_owner()
+    async def shardstats(self, ctx: commands.Context):
+        stats = self.bot.shard_stats
+        lines = [
+            f"Shard {shard_id}: "
+            + f"{round(stats.latencies.get(shard_id, float('nan'))*1000, 2)} ms, "
+            + f"{round(rate, 2)} events/sec, "
+            + f"{stats.events[shard_id]} events, "
+            + f"{sum(1 for g in self.bot.guilds if g.shard_id == shard_id)} guilds"
+            for shard_id, rate in sorted(stats.rates.items())
+        ]
+        await ctx.reply(
+            embed=discord.Embed(
+                title="Shards",
+                description="\n".join(lines)[:4096] or "No samples yet",
+            )
+        )
+
+    @commands.command(name="cachestats", hidden=True)
+    @commands.is_owner()
+    async def cachestats(self, ctx: commands.Context):
+        intents = [name for name, enabled in self.bot.intents if enabled]
+        max_messages = self.bot._connection.max_messages
+        await ctx.reply(
+            embed=discord.Embed(
+                title="Caches",
+                description=f"Guilds: {len(self.bot.guilds)}\n"
+                + f"Channels: {sum(len(g.channels) for g in self.bot.guilds)}\n"
+                + f"Members: {sum(len(g.members) for g in self.bot.guilds)}\n"
+                + f"Users: {len(self.bot.users)}\n"
+                + f"Messages: {len(self.bot.cached_messages)}/{max_messages}\n"
+                + f"Emojis: {len(self.bot.emojis)}\n"
+                + f"Intents: {', '.join(intents)}",
+            )
+        )
+
+    @commands.command(name="metrics", hidden=True)
+    @commands.is_owner()
+    async def metrics(self, ctx: commands.Context, command: str = None):
+        lines = []
+        for (cmd, stage), hist in sorted(self.bot.metrics.histograms.items()):
+            if command is not None and cmd != command:
+                continue
+            lines.append(
+                f"`{cmd}.{stage}`: {hist.count}x, "
+                + f"p50 {round(hist.quantile(0.5)*1000, 1)} ms, "
+                + f"p95 {round(hist.quantile(0.95)*1000, 1)} ms, "
+                + f"p99 {round(hist.quantile(0.99)*1000, 1)} ms"
+            )
+        await ctx.reply(
+            embed=discord.Embed(
+                title="Latency",
+                description="\n".join(lines)[:4096] or "No data recorded",
+            )
+        )
+
     @commands.hybrid_command(
         name="ping", with_app_command=True, description="Checks API response time"
     )
@@ -0,0 +1,167 @@
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator, Dict, Hashable, List
+
+
+class TokenBucket:
+    """Async token bucket rate limiter
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second
+    burst : int
+        Maximum number of tokens that can be stored
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and consumes it"""
+        # The lock makes waiters take tokens in arrival order
+        async with self.lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class KeyedSemaphores:
+    """Semaphores created on demand per key, removed again once idle
+
+    Parameters
+    ----------
+    value : int
+        Concurrent holders allowed per key
+    """
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+        self._semaphores: Dict[Hashable, asyncio.Semaphore] = {}
+        self._users: Dict[Hashable, int] = {}
+
+    async def acquire(self, key: Hashable) -> None:
+        sem = self._semaphores.setdefault(key, asyncio.Semaphore(self.value))
+        self._users[key] = self._users.get(key, 0) + 1
+        try:
+            await sem.acquire()
+        except BaseException:
+            self._forget(key)
+            raise
+
+    def release(self, key: Hashable) -> None:
+        self._semaphores[key].release()
+        self._forget(key)
+
+    def _forget(self, key: Hashable) -> None:
+        self._users[key] -= 1
+        if self._users[key] == 0:
+            del self._users[key]
+            del self._semaphores[key]
+
+    def __len__(self) -> int:
+        return len(self._semaphores)
+
+
+class AdmissionController:
+    """Fair admission of work shared by every user and guild
+
+    Each admitted job holds a per-user, a per-guild and a global slot, so a
+    single user or guild cannot take up the whole bot. Jobs without free
+    slots wait in a bounded queue instead of being rejected.
+
+    Parameters
+    ----------
+    max_active : int
+        (Optional) Jobs running at once across the bot. (Default=8)
+    per_guild : int
+        (Optional) Jobs running at once per guild. (Default=3)
+    per_user : int
+        (Optional) Jobs running at once per user. (Default=1)
+    max_queue : int
+        (Optional) Jobs allowed to wait for a slot. (Default=50)
+
+    Attributes
+    ----------
+    active : int
+        Number of admitted jobs
+    waiting : int
+        Number of jobs waiting for a slot
+    rejected : int
+        Number of jobs turned away because the queue was full
+
+    Raises
+    ----------
+    AdmissionController.QueueFull: when the queue is full
+    """
+
+    def __init__(
+        self,
+        max_active: int = 8,
+        per_guild: int = 3,
+        per_user: int = 1,
+        max_queue: int = 50,
+    ) -> None:
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._global = asyncio.Semaphore(max_active)
+        self._guilds = KeyedSemaphores(per_guild)
+        self._users = KeyedSemaphores(per_user)
+
+    class QueueFull(Exception):
+        pass
+
+    @contextlib.asynccontextmanager
+    async def admit(self, user_id: int, guild_id: int | None) -> AsyncIterator[None]:
+        """Waits for a user, guild and global slot
+
+        Parameters
+        ----------
+        user_id : int
+            Discord ID of the requesting user
+        guild_id : int | None
+            Discord ID of the guild, None for DMs (grouped per user)
+        """
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionController.QueueFull
+
+        guild_key = guild_id if guild_id is not None else f"dm-{user_id}"
+        held: List[tuple] = []
+        self.waiting += 1
+        try:
+            await self._users.acquire(user_id)
+            held.append((self._users, user_id))
+            await self._guilds.acquire(guild_key)
+            held.append((self._guilds, guild_key))
+            await self._global.acquire()
+        except BaseException:
+            for sems, key in reversed(held):
+                sems.release(key)
+            raise
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._global.release()
+            for sems, key in reversed(held):
+                sems.release(key)
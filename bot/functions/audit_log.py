@@ -0,0 +1,161 @@
+import datetime
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Deque, List
+
+import discord
+from discord.ext import commands, tasks
+
+if TYPE_CHECKING:
+    from studybot import StudyBot
+
+# Discord limits per message
+max_message_embeds = 10
+max_message_chars = 6000
+
+
+class AuditLog:
+    """Batched command usage log for the logging channel
+
+    Commands are recorded in memory and sent in batches by a background
+    loop, so invoking a command never waits on the Discord API. When more
+    commands are used than fit in a flush, the rest are only counted and
+    sent as a summary. Command messages are truncated so a batch of long
+    queries cannot exceed Discord's message size limit.
+
+    Parameters
+    ----------
+    bot : StudyBot
+        Bot instance
+    max_embeds : int
+        (Optional) Embeds sent per flush, including the summary. (Default=20)
+    max_queue : int
+        (Optional) Commands held between flushes. (Default=200)
+    max_content : int
+        (Optional) Characters of each command message kept. (Default=500)
+
+    Attributes
+    ----------
+    queue : Deque[dict]
+        Recorded command uses waiting to be sent
+    dropped : Counter
+        Commands per name that were only counted, not sent
+    """
+
+    def __init__(
+        self,
+        bot: "StudyBot",
+        max_embeds: int = 20,
+        max_queue: int = 200,
+        max_content: int = 500,
+    ) -> None:
+        self.bot = bot
+        self.max_embeds = max_embeds
+        self.max_queue = max_queue
+        self.max_content = max_content
+        self.queue: Deque[dict] = deque()
+        self.dropped: Counter = Counter()
+
+    def record(self, ctx: commands.Context) -> None:
+        """Queues a command use for the next flush
+
+        Parameters
+        ----------
+        ctx : commands.Context
+        """
+        if len(self.queue) >= self.max_queue:
+            self.dropped[ctx.command.name] += 1
+            return
+
+        content = ctx.message.content
+        if len(content) > self.max_content:
+            content = content[: self.max_content - 3] + "..."
+
+        self.queue.append(
+            {
+                "command": ctx.command.name,
+                "content": content,
+                "author": str(ctx.author),
+                "avatar": ctx.author.display_avatar.url,
+                "timestamp": datetime.datetime.now(),
+            }
+        )
+
+    def build_embeds(self) -> List[discord.Embed]:
+        """Empties the queue into embeds to send
+
+        Returns
+        -------
+        List[discord.Embed]
+            Command embeds, followed by a summary of any dropped commands
+        """
+        embeds = []
+        while self.queue and len(embeds) < self.max_embeds - 1:
+            event = self.queue.popleft()
+            embed = discord.Embed(
+                title=event["command"],
+                description=event["content"],
+                timestamp=event["timestamp"],
+            )
+            embed.set_author(name=event["author"], icon_url=event["avatar"])
+            embeds.append(embed)
+
+        # aggregate everything that did not fit in this flush
+        while self.queue:
+            self.dropped[self.queue.popleft()["command"]] += 1
+
+        if self.dropped:
+            embeds.append(
+                discord.Embed(
+                    title="Other commands used",
+                    description="\n".join(
+                        f"{name}: {count}" for name, count in self.dropped.most_common()
+                    )[:4096],
+                    timestamp=datetime.datetime.now(),
+                )
+            )
+            self.dropped.clear()
+        return embeds
+
+    @staticmethod
+    def batch_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+        """Groups embeds into messages within Discord's limits
+
+        Parameters
+        ----------
+        embeds : List[discord.Embed]
+            Embeds from build_embeds
+
+        Returns
+        -------
+        List[List[discord.Embed]]
+            Embeds of each message
+        """
+        batches: List[List[discord.Embed]] = []
+        chars = 0
+        for embed in embeds:
+            if (
+                not batches
+                or len(batches[-1]) >= max_message_embeds
+                or chars + len(embed) > max_message_chars
+            ):
+                batches.append([])
+                chars = 0
+            batches[-1].append(embed)
+            chars += len(embed)
+        return batches
+
+    @tasks.loop(seconds=10)
+    async def flush(self) -> None:
+        """Sends queued command uses to the logging channel"""
+        channel = getattr(self.bot, "logging_channel", None)
+        if channel is None or not (self.queue or self.dropped):
+            return
+
+        # a failed message does not stop the rest of the batch
+        for batch in self.batch_embeds(self.build_embeds()):
+            try:
+                await channel.send(embeds=batch)
+            except Exception as e:
+                self.bot.logger.error(
+                    f"Could not send {len(batch)} command log entries: {e}"
+                )
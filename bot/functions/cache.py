@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a fixed time
+
+    Parameters
+    ----------
+    maxsize : int
+        (Optional) Maximum number of entries kept. (Default=128)
+    ttl : float
+        (Optional) Seconds before an entry expires. (Default=300.0)
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that returned a cached value
+    misses : int
+        Number of lookups that found nothing or an expired entry
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns a cached value, marking it as recently used
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key
+        default : Any
+            (Optional) Returned if key is missing or expired. (Default=None)
+
+        Returns
+        -------
+        Any
+            Cached value or default
+        """
+        try:
+            expiry, value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        if expiry < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entry if full
+
+        Parameters
+        ----------
+        key : Hashable
+            Cache key
+        value : Any
+            Value to store
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
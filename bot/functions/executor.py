@@ -0,0 +1,106 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class StageTiming:
+    """Accumulated run time of a single executor stage
+
+    Attributes
+    ----------
+    count : int
+        Number of completed jobs
+    total : float
+        Total run time in seconds
+    max : float
+        Longest run time in seconds
+    """
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class ExecutorService:
+    """Worker pool for CPU-bound work that would otherwise block the event loop
+
+    Jobs are run on a thread pool. The number of jobs submitted at once is
+    bounded, so callers wait for a free slot instead of growing an
+    unbounded backlog.
+
+    Parameters
+    ----------
+    max_workers : int
+        (Optional) Number of worker threads. (Default=min(4, cpu count))
+    max_queue : int
+        (Optional) Jobs allowed to wait for a worker. (Default=32)
+
+    Attributes
+    ----------
+    timings : Dict[str, StageTiming]
+        Run time statistics per stage name
+    """
+
+    def __init__(self, max_workers: int | None = None, max_queue: int = 32) -> None:
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="studybot-worker"
+        )
+        self.slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+        self.pending = 0
+        self.timings: Dict[str, StageTiming] = {}
+
+    async def run(self, stage: str, func: Callable, *args, **kwargs) -> Any:
+        """Runs a function on the worker pool
+
+        Parameters
+        ----------
+        stage : str
+            Name the run time is recorded under (e.g. "google.parse")
+        func : Callable
+            Synchronous function to run
+        *args, **kwargs
+            Arguments passed to func
+
+        Returns
+        -------
+        Any
+            Return value of func
+        """
+
+        def timed_call() -> tuple:
+            t0 = time.perf_counter()
+            result = func(*args, **kwargs)
+            return result, time.perf_counter() - t0
+
+        async with self.slots:
+            self.pending += 1
+            try:
+                result, elapsed = await asyncio.get_running_loop().run_in_executor(
+                    self.pool, timed_call
+                )
+            finally:
+                self.pending -= 1
+
+        # Recorded on the event loop so workers never touch shared state
+        self.timings.setdefault(stage, StageTiming()).add(elapsed)
+        return result
+
+    def shutdown(self) -> None:
+        """Stops accepting jobs and releases the worker threads"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,90 @@
+import json
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable, Iterator, Tuple
+
+
+class ExpiringSet:
+    """Set whose members expire a fixed time after they were added
+
+    Members are kept in a dict for O(1) lookups and in a deque ordered by
+    insertion time, so expiring old members never scans the whole set.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds a member stays in the set
+    path : str
+        (Optional) JSON file the set is loaded from and saved to.
+        Not persisted if None. (Default=None)
+    """
+
+    def __init__(self, ttl: float, path: str | None = None) -> None:
+        self.ttl = ttl
+        self.path = path
+        self._added: Dict[Hashable, float] = {}
+        self._order: Deque[Tuple[float, Hashable]] = deque()
+
+        if path is not None:
+            self.load()
+
+    def add(self, key: Hashable, added: float | None = None) -> None:
+        """Adds a member, restarting its expiry if already present
+
+        Parameters
+        ----------
+        key : Hashable
+            Member to add
+        added : float
+            (Optional) Unix time the member was added. (Default=now)
+        """
+        added = time.time() if added is None else added
+        self._added[key] = added
+        self._order.append((added, key))
+        self.expire()
+
+    def expire(self) -> None:
+        """Removes members older than the ttl"""
+        cutoff = time.time() - self.ttl
+        while self._order and self._order[0][0] <= cutoff:
+            added, key = self._order.popleft()
+            # skip entries superseded by a later add of the same key
+            if self._added.get(key) == added:
+                del self._added[key]
+
+    def load(self) -> None:
+        """Loads unexpired members from the snapshot file, if it exists"""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                snapshot: dict = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        for key, added in sorted(snapshot.items(), key=lambda i: i[1]):
+            self._added[key] = added
+            self._order.append((added, key))
+        self.expire()
+
+    def save(self) -> None:
+        """Writes the unexpired members to the snapshot file"""
+        if self.path is None:
+            return
+
+        self.expire()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._added, file)
+        os.replace(tmp_path, self.path)
+
+    def __contains__(self, key: Hashable) -> bool:
+        added = self._added.get(key)
+        return added is not None and time.time() - added < self.ttl
+
+    def __iter__(self) -> Iterator[Hashable]:
+        self.expire()
+        return iter(tuple(self._added))
+
+    def __len__(self) -> int:
+        self.expire()
+        return len(self._added)
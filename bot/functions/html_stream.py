@@ -0,0 +1,94 @@
+from typing import List
+
+from lxml import etree
+
+
+class HTMLBlockStream:
+    """Incremental extractor for the child blocks of an HTML container
+
+    Response chunks are fed as they arrive. Every direct child of the
+    container element is returned as an HTML string as soon as its closing
+    tag has been parsed, and the parsed elements are freed immediately, so
+    the full page is never held in memory.
+
+    Parameters
+    ----------
+    container_id : str
+        id attribute of the container div (e.g. "main")
+    encoding : str
+        (Optional) Encoding of the fed bytes, detected if None. (Default=None)
+
+    Attributes
+    ----------
+    found : bool
+        True once the container element has been seen
+    """
+
+    def __init__(self, container_id: str, encoding: str | None = None) -> None:
+        self.container_id = container_id
+        self.found = False
+        self.parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+
+        # Nesting depth inside the container, 0 when outside of it
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """Parses a chunk of the document
+
+        Parameters
+        ----------
+        chunk : bytes
+            Next part of the raw HTML
+
+        Returns
+        -------
+        List[str]
+            HTML of the container blocks completed by this chunk
+        """
+        self.parser.feed(chunk)
+        return self._read_blocks()
+
+    def close(self) -> List[str]:
+        """Finishes parsing the document
+
+        Returns
+        -------
+        List[str]
+            HTML of any container blocks completed at the end of the document
+        """
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        return self._read_blocks()
+
+    def _read_blocks(self) -> List[str]:
+        blocks = []
+        for event, element in self.parser.read_events():
+            if event == "start":
+                if self._depth:
+                    self._depth += 1
+                elif (
+                    not self.found
+                    and element.tag == "div"
+                    and element.get("id") == self.container_id
+                ):
+                    self.found = True
+                    self._depth = 1
+                continue
+
+            if self._depth == 2:
+                # direct child of the container has finished
+                blocks.append(
+                    etree.tostring(
+                        element, encoding="unicode", method="html", with_tail=False
+                    )
+                )
+                element.clear()
+            elif self._depth == 0:
+                # nothing outside of the container is needed
+                element.clear()
+
+            if self._depth:
+                self._depth -= 1
+        return blocks
@@ -0,0 +1,136 @@
+import asyncio
+from typing import TYPE_CHECKING, Dict
+from urllib.parse import urlsplit
+
+import aiohttp
+import validators
+from functions.cache import TTLCache
+
+if TYPE_CHECKING:
+    from studybot import StudyBot
+
+
+class ImageValidator:
+    """Checks that image URLs load, remembering results between searches
+
+    Each URL is checked with a HEAD request. Valid and invalid URLs are
+    cached separately, invalid ones for a shorter time as hosts may
+    recover. Hosts that time out are skipped for a while so that one slow
+    host does not hold up every search linking to it.
+
+    Parameters
+    ----------
+    bot : StudyBot
+        Bot instance, its "images" web pool is used for requests
+    max_concurrent : int
+        (Optional) HEAD requests allowed at once. (Default=8)
+    timeout : float
+        (Optional) Seconds allowed per request. (Default=3.0)
+    host_timeouts : Dict[str, float]
+        (Optional) Seconds allowed per request to specific hosts,
+        overriding timeout. (Default=None)
+    ttl : float
+        (Optional) Seconds a valid URL is remembered. (Default=3600.0)
+    negative_ttl : float
+        (Optional) Seconds an invalid URL or slow host is remembered.
+        (Default=300.0)
+
+    Attributes
+    ----------
+    valid : functions.cache.TTLCache
+        URLs that were valid
+    invalid : functions.cache.TTLCache
+        URLs that were invalid
+    slow_hosts : functions.cache.TTLCache
+        Hosts that recently timed out
+    in_flight : Dict[str, asyncio.Task]
+        Checks currently running, shared by concurrent searches
+    requests : int
+        Number of HEAD requests sent
+    timeouts : int
+        Number of HEAD requests that timed out
+    """
+
+    def __init__(
+        self,
+        bot: "StudyBot",
+        max_concurrent: int = 8,
+        timeout: float = 3.0,
+        host_timeouts: Dict[str, float] | None = None,
+        ttl: float = 3600.0,
+        negative_ttl: float = 300.0,
+    ) -> None:
+        self.bot = bot
+        self.timeout = timeout
+        self.host_timeouts = host_timeouts or {}
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.valid = TTLCache(maxsize=2048, ttl=ttl)
+        self.invalid = TTLCache(maxsize=2048, ttl=negative_ttl)
+        self.slow_hosts = TTLCache(maxsize=256, ttl=negative_ttl)
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self.requests = 0
+        self.timeouts = 0
+
+    async def validate(self, url: str) -> bool:
+        """Checks if a URL links to an image that will embed
+
+        Parameters
+        ----------
+        url : str
+            Parsed image URL
+
+        Returns
+        -------
+        bool
+            True if valid URL
+        """
+        if self.valid.get(url, False):
+            return True
+        if self.invalid.get(url, False) or not validators.url(url):
+            return False
+
+        host = urlsplit(url).hostname
+        if self.slow_hosts.get(host, False):
+            return False
+
+        # identical URLs from concurrent searches share one request
+        if url not in self.in_flight:
+            task = asyncio.ensure_future(self.check(url, host))
+            self.in_flight[url] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(url, None))
+        return await asyncio.shield(self.in_flight[url])
+
+    async def check(self, url: str, host: str) -> bool:
+        """Sends the HEAD request for a URL and caches the result
+
+        Parameters
+        ----------
+        url : str
+            Parsed image URL
+        host : str
+            Host of the URL
+
+        Returns
+        -------
+        bool
+            True if valid URL
+        """
+        timeout = aiohttp.ClientTimeout(
+            total=self.host_timeouts.get(host, self.timeout)
+        )
+        async with self.slots:
+            self.requests += 1
+            try:
+                async with self.bot.web.head(
+                    "images", url, allow_redirects=False, timeout=timeout
+                ) as resp:
+                    is_valid = resp.status < 300
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self.slow_hosts.set(host, True)
+                is_valid = False
+            except Exception:
+                is_valid = False
+
+        (self.valid if is_valid else self.invalid).set(url, True)
+        return is_valid
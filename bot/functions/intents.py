@@ -0,0 +1,78 @@
+import importlib
+import inspect
+from typing import Dict, Iterable, Tuple
+
+import discord
+from discord.ext import commands
+
+# Intents Discord needs to send each event, events not listed need none
+event_intents: Dict[str, Tuple[str, ...]] = {
+    "on_message": ("guild_messages", "dm_messages", "message_content"),
+    "on_message_edit": ("guild_messages", "dm_messages", "message_content"),
+    "on_raw_message_edit": ("guild_messages", "dm_messages", "message_content"),
+    "on_message_delete": ("guild_messages", "dm_messages"),
+    "on_guild_join": ("guilds",),
+    "on_guild_remove": ("guilds",),
+    "on_guild_channel_create": ("guilds",),
+    "on_guild_channel_delete": ("guilds",),
+    "on_member_join": ("members",),
+    "on_member_remove": ("members",),
+    "on_member_update": ("members",),
+    "on_presence_update": ("presences",),
+    "on_reaction_add": ("guild_reactions", "dm_reactions"),
+    "on_reaction_remove": ("guild_reactions", "dm_reactions"),
+    "on_typing": ("guild_typing", "dm_typing"),
+    "on_voice_state_update": ("voice_states",),
+}
+
+# Events the bot itself relies on: prefix commands are read from messages,
+# and searches wait for edits of the command message
+bot_events = ("on_message", "on_raw_message_edit")
+
+
+def cog_events(extensions: Iterable[str]) -> set:
+    """Finds the events listened to by the cogs of extensions
+
+    The extension modules are imported without being loaded, so intents
+    can be chosen before the bot connects
+
+    Parameters
+    ----------
+    extensions : Iterable[str]
+        Extension module names (e.g. "cogs.utilities")
+
+    Returns
+    -------
+    set
+        Event names (e.g. "on_message")
+    """
+    events = set()
+    for ext in extensions:
+        module = importlib.import_module(ext)
+        for _, cog in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cog, commands.Cog) and cog.__module__ == module.__name__:
+                events.update(name for name, _ in cog.__cog_listeners__)
+    return events
+
+
+def minimal_intents(extensions: Iterable[str]) -> discord.Intents:
+    """Gives the fewest intents needed by the bot and its cogs
+
+    Guilds are always enabled, as channels are cached from guild events
+
+    Parameters
+    ----------
+    extensions : Iterable[str]
+        Extension module names of the cogs to be loaded
+
+    Returns
+    -------
+    discord.Intents
+        Intents with only the needed flags set
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    for event in cog_events(extensions).union(bot_events):
+        for flag in event_intents.get(event, ()):
+            setattr(intents, flag, True)
+    return intents
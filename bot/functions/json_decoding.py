@@ -0,0 +1,33 @@
+import json
+from typing import Any, Callable, Dict
+
+import orjson
+
+# Decoders selectable with JSON_DECODER, orjson decodes several times faster
+decoders: Dict[str, Callable[[bytes | str], Any]] = {
+    "orjson": orjson.loads,
+    "json": json.loads,
+}
+
+
+def get_decoder(name: str | None = None) -> Callable[[bytes | str], Any]:
+    """Returns a JSON loads function by name
+
+    Parameters
+    ----------
+    name : str
+        (Optional) Key of decoders, orjson if None. (Default=None)
+
+    Returns
+    -------
+    (bytes | str) -> Any
+        Function decoding a JSON document
+
+    Raises
+    ----------
+    ValueError: when the decoder is unknown
+    """
+    try:
+        return decoders[name or "orjson"]
+    except KeyError:
+        raise ValueError(f"Unknown JSON decoder {name}, use one of {list(decoders)}")
@@ -0,0 +1,180 @@
+import bisect
+import contextlib
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from discord.ext import tasks
+
+# Upper bounds in seconds of the histogram buckets
+default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Latency histogram with fixed buckets
+
+    Parameters
+    ----------
+    buckets : Tuple[float]
+        (Optional) Sorted bucket upper bounds in seconds.
+        (Default=default_buckets)
+
+    Attributes
+    ----------
+    counts : List[int]
+        Observations per bucket, the last bucket has no upper bound
+    count : int
+        Total number of observations
+    sum : float
+        Total of all observations in seconds
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = default_buckets) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile by interpolating within its bucket
+
+        Parameters
+        ----------
+        q : float
+            Quantile between 0 and 1 (e.g. 0.95)
+
+        Returns
+        -------
+        float
+            Estimated value in seconds
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                # the overflow bucket has no upper bound to interpolate to
+                if i == len(self.buckets):
+                    return lower
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Per-command, per-stage latency metrics
+
+    Parameters
+    ----------
+    path : str
+        (Optional) File the metrics are exported to in the Prometheus text
+        format. Not exported if None. (Default=None)
+    labels : Dict[str, str]
+        (Optional) Labels added to every exported series (e.g. the cluster).
+        (Default=None)
+
+    Attributes
+    ----------
+    histograms : Dict[Tuple[str, str], Histogram]
+        Histogram per (command, stage)
+    sinks : List[(str) -> None]
+        Functions the exported text is passed to, writes to path by default
+    """
+
+    def __init__(
+        self, path: str | None = None, labels: Dict[str, str] | None = None
+    ) -> None:
+        self.path = path
+        self.labels = labels or {}
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self.sinks: List[Callable[[str], None]] = [self.write] if path else []
+
+    def observe(self, command: str, stage: str, seconds: float) -> None:
+        """Records the duration of a stage
+
+        Parameters
+        ----------
+        command : str
+            Command name (e.g. "google")
+        stage : str
+            Stage name (e.g. "fetch", "parse", "embed", "edit")
+        seconds : float
+            Duration of the stage
+        """
+        key = (command, stage)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram()
+        self.histograms[key].observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, command: str, stage: str) -> Iterator[None]:
+        """Times the enclosed block as a stage of a command
+
+        Parameters
+        ----------
+        command : str
+            Command name (e.g. "google")
+        stage : str
+            Stage name (e.g. "fetch", "parse", "embed", "edit")
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(command, stage, time.perf_counter() - t0)
+
+    def render(self) -> str:
+        """Formats all histograms in the Prometheus text format
+
+        Returns
+        -------
+        str
+            Prometheus exposition text
+        """
+        lines = [
+            "# HELP studybot_stage_seconds Duration of command stages",
+            "# TYPE studybot_stage_seconds histogram",
+        ]
+        extra_labels = "".join(f'{k}="{v}",' for k, v in self.labels.items())
+        for (command, stage), hist in sorted(self.histograms.items()):
+            labels = f'{extra_labels}command="{command}",stage="{stage}"'
+            bounds = [str(b) for b in hist.buckets] + ["+Inf"]
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, hist.counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'studybot_stage_seconds_bucket{{{labels},le="{bound}"}} '
+                    + f"{cumulative}"
+                )
+            lines.append(f"studybot_stage_seconds_sum{{{labels}}} {hist.sum}")
+            lines.append(f"studybot_stage_seconds_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, text: str) -> None:
+        """Writes exported metrics to the metrics file
+
+        Parameters
+        ----------
+        text : str
+            Output of Metrics.render
+        """
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(tmp_path, self.path)
+
+    @tasks.loop(seconds=60)
+    async def export(self) -> None:
+        """Periodically passes the rendered metrics to every sink"""
+        text = self.render()
+        for sink in self.sinks:
+            sink(text)
@@ -1,9 +1,10 @@
-from typing import List
+from typing import TYPE_CHECKING, Callable, Dict, Sequence
 
 import discord
 from discord.ext import commands
 
-from studybot import StudyBot
+if TYPE_CHECKING:
+    from studybot import StudyBot
 
 
 class PageTurnView(discord.ui.View):
@@ -14,8 +15,9 @@ class PageTurnView(discord.ui.View):
         Bot instance
     ctx : discord.ext.commands.Context
         Discord's command context
-    embed_list: List[discord.Embed]
-        List of embeds to page turn
+    embed_list: Sequence[discord.Embed | () -> discord.Embed]
+        Pages to page turn. Pages given as functions are only rendered
+        when first viewed, then reused until pages are added
     message: discord.Message
         The message containing the buttons.
     timeout: float
@@ -28,20 +30,78 @@ class PageTurnView(discord.ui.View):
 
     def __init__(
         self,
-        bot: StudyBot,
+        bot: "StudyBot",
         ctx: commands.Context,
-        embed_list: List[discord.Embed],
+        embed_list: Sequence[discord.Embed | Callable[[], discord.Embed]],
         message: discord.Message,
         timeout=60.0,
     ):
         self.bot = bot
         self.ctx = ctx
-        self.embed_list = embed_list
+        self.embed_list = list(embed_list)
+        self.rendered: Dict[int, discord.Embed] = {}
         self.current_page = 0
         self.message = message
 
         super().__init__(timeout=timeout)
 
+    def get_page(self, index: int) -> discord.Embed:
+        """Returns a page, rendering it on first view
+
+        Parameters
+        ----------
+        index : int
+            Page index, wraps around the number of pages
+
+        Returns
+        -------
+        discord.Embed
+            Embed of the page
+        """
+        index %= len(self.embed_list)
+        if index not in self.rendered:
+            page = self.embed_list[index]
+            self.rendered[index] = page() if callable(page) else page
+        return self.rendered[index]
+
+    def add_page(self, page: discord.Embed | Callable[[], discord.Embed]) -> None:
+        """Appends a page while the view is shown
+
+        Rendered pages are discarded, as they may show the page count
+
+        Parameters
+        ----------
+        page : discord.Embed | () -> discord.Embed
+            Page to add
+        """
+        self.embed_list.append(page)
+        self.rendered.clear()
+
+    def set_pages(
+        self,
+        embed_list: Sequence[discord.Embed | Callable[[], discord.Embed]],
+        current_page: int = 0,
+    ) -> None:
+        """Replaces every page while the view is shown
+
+        Parameters
+        ----------
+        embed_list : Sequence[discord.Embed | () -> discord.Embed]
+            New pages
+        current_page : int
+            (Optional) Index of the page shown. (Default=0)
+        """
+        self.embed_list = list(embed_list)
+        self.rendered.clear()
+        self.current_page = current_page
+
+    async def refresh(self) -> None:
+        """Re-renders the page currently shown"""
+        try:
+            await self.message.edit(embed=self.get_page(self.current_page), view=self)
+        except Exception:
+            pass
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
         # Checks if user or bot dev interacted
         return any(
@@ -75,10 +135,10 @@ class PageTurnView(discord.ui.View):
     @discord.ui.button(emoji="◀️", style=discord.ButtonStyle.gray)
     async def prev_callback(self, interaction: discord.Interaction, _):
         try:
-            self.current_page -= 1
+            self.current_page = (self.current_page - 1) % len(self.embed_list)
             await interaction.response.edit_message(
                 content="",
-                embed=self.embed_list[self.current_page % len(self.embed_list)],
+                embed=self.get_page(self.current_page),
             )
         except Exception:
             super().clear_items()
@@ -89,10 +149,10 @@ class PageTurnView(discord.ui.View):
     @discord.ui.button(emoji="▶️", style=discord.ButtonStyle.gray)
     async def next_callback(self, interaction: discord.Interaction, _):
         try:
-            self.current_page += 1
+            self.current_page = (self.current_page + 1) % len(self.embed_list)
             await interaction.response.edit_message(
                 content="",
-                embed=self.embed_list[self.current_page % len(self.embed_list)],
+                embed=self.get_page(self.current_page),
             )
         except Exception:
             super().clear_items()
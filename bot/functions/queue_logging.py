@@ -0,0 +1,53 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when full
+
+    Records are written by a QueueListener on its own thread, so logging
+    only costs an enqueue for the caller.
+
+    Parameters
+    ----------
+    maxsize : int
+        (Optional) Records allowed to wait for the writer. (Default=10000)
+
+    Attributes
+    ----------
+    dropped : int
+        Number of records discarded because the queue was full
+    """
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    @property
+    def depth(self) -> int:
+        """Number of records waiting to be written"""
+        return self.queue.qsize()
+
+    def listen(self, *handlers: logging.Handler) -> QueueListener:
+        """Starts a writer thread passing queued records to handlers
+
+        Parameters
+        ----------
+        *handlers : logging.Handler
+            Handlers that do the actual writing, their levels are respected
+
+        Returns
+        -------
+        QueueListener
+            Started listener, stop it to flush remaining records
+        """
+        listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        return listener
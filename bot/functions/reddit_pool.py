@@ -0,0 +1,283 @@
+import asyncio
+import random
+import time
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, List, NamedTuple
+
+import validators
+
+if TYPE_CHECKING:
+    from studybot import StudyBot
+
+
+class RedditPost(NamedTuple):
+    """Fields of a Reddit post used to send it"""
+
+    id: str
+    subreddit: str
+    title: str
+    url: str
+
+
+class RedditPostPool:
+    """Per-subreddit pools of prefetched image posts
+
+    Pools are filled from the Reddit listing API and only keep posts that
+    link to an image host, so commands can take a post from memory instead
+    of downloading a listing each time.
+
+    Parameters
+    ----------
+    bot : StudyBot
+        Bot instance, used for its web pools, JSON decoder and worker pool
+    image_domains : Tuple[str]
+        (Optional) Hosts an image post must link to.
+        (Default=("i.imgur", "i.redd.it"))
+    low_water : int
+        (Optional) Pool size under which a pool in use is refilled. (Default=10)
+
+    Attributes
+    ----------
+    pools : Dict[str, List[RedditPost]]
+        Unsent image posts per subreddit
+    refreshed : Dict[str, float]
+        Time each pool was last refreshed
+    used : Dict[str, float]
+        Time each subreddit was last drawn from
+    yields : Dict[str, float]
+        Moving average of image posts per listing, per subreddit
+    fetches : int
+        Number of listing requests made
+    """
+
+    def __init__(
+        self,
+        bot: "StudyBot",
+        image_domains: tuple = ("i.imgur", "i.redd.it"),
+        low_water: int = 10,
+    ) -> None:
+        self.bot = bot
+        self.image_domains = image_domains
+        self.low_water = low_water
+        self.pools: Dict[str, List[RedditPost]] = {}
+        self.refreshed: Dict[str, float] = {}
+        self.used: Dict[str, float] = {}
+        self.yields: Dict[str, float] = {}
+        self.fetches = 0
+
+    class NoPosts(Exception):
+        pass
+
+    def filter_posts(self, body: bytes) -> List[RedditPost]:
+        """Decodes a listing and keeps only image posts
+
+        Parameters
+        ----------
+        body : bytes
+            Raw JSON response from the Reddit API
+
+        Returns
+        -------
+        List[RedditPost]
+            Image posts
+        """
+        posts = []
+        for child in self.bot.json_loads(body)["data"]["children"]:
+            post: dict = child["data"]
+            if (
+                # is img post
+                "url_overridden_by_dest" in post
+                # permitted domains
+                and any(domain in post["url"] for domain in self.image_domains)
+                # valid url
+                and validators.url(post["url"])
+            ):
+                # the rest of the post is dropped to keep pools small
+                posts.append(
+                    RedditPost(
+                        post["id"], post["subreddit"], post["title"], post["url"]
+                    )
+                )
+        return posts
+
+    async def refresh(self, subreddit: str) -> int:
+        """Replaces the pool of a subreddit with its newest image posts
+
+        Parameters
+        ----------
+        subreddit : str
+            Subreddit name (no r/)
+
+        Returns
+        -------
+        int
+            Number of image posts in the refreshed pool
+        """
+        url = f"https://www.reddit.com/r/{subreddit}.json?sort=new&limit=100"
+        self.fetches += 1
+        async with self.bot.web.get(
+            "reddit", url, headers={"User-Agent": "studybot/reddit-search"}
+        ) as data:
+            body = await data.read()
+
+        posts = await self.bot.executor.run("reddit.filter", self.filter_posts, body)
+        self.pools[subreddit] = posts
+        self.refreshed[subreddit] = time.time()
+        self.yields[subreddit] = (
+            (self.yields[subreddit] + len(posts)) / 2
+            if subreddit in self.yields
+            else float(len(posts))
+        )
+        return len(posts)
+
+    async def refresh_all(self, subreddits: Iterable[str], delay: float = 1.0) -> None:
+        """Refreshes several pools, spaced out to go easy on the Reddit API
+
+        Parameters
+        ----------
+        subreddits : Iterable[str]
+            Subreddit names (no r/)
+        delay : float
+            (Optional) Seconds between requests. (Default=1.0)
+        """
+        for subreddit in subreddits:
+            try:
+                await self.refresh(subreddit)
+            except Exception as e:
+                self.bot.logger.info(f"Could not refresh r/{subreddit}: {e}")
+            await asyncio.sleep(delay)
+
+    def due(
+        self, subreddits: Iterable[str], idle: float = 3600.0, max_age: float = 3600.0
+    ) -> List[str]:
+        """Finds the pools worth refreshing ahead of use
+
+        Only subreddits drawn from within the idle window are considered, and
+        of those only pools below the low-water mark or older than max_age.
+        Pools nobody uses are left to be refilled on demand by select
+
+        Parameters
+        ----------
+        subreddits : Iterable[str]
+            Subreddit names (no r/)
+        idle : float
+            (Optional) Seconds since last use after which a pool is left
+            alone. (Default=3600.0)
+        max_age : float
+            (Optional) Seconds after which a pool in use is refreshed even
+            if it is not low. (Default=3600.0)
+
+        Returns
+        -------
+        List[str]
+            Subreddit names to refresh
+        """
+        now = time.time()
+        return [
+            s
+            for s in subreddits
+            if now - self.used.get(s, float("-inf")) < idle
+            and (
+                len(self.pools.get(s, ())) < self.low_water
+                or now - self.refreshed.get(s, float("-inf")) > max_age
+            )
+        ]
+
+    def take(
+        self, subreddits: Collection[str], exclude: Collection[str]
+    ) -> RedditPost | None:
+        """Removes and returns a random post from the given subreddits
+
+        Parameters
+        ----------
+        subreddits : Collection[str]
+            Subreddits to pick from (no r/)
+        exclude : Collection[str]
+            IDs of posts that must not be returned (e.g. already sent)
+
+        Returns
+        -------
+        RedditPost | None
+            Post, None if the pools have no eligible post
+        """
+        now = time.time()
+        for subreddit in subreddits:
+            self.used[subreddit] = now
+
+        candidates = [s for s in subreddits if self.pools.get(s)]
+        while candidates:
+            subreddit = random.choice(candidates)
+            pool = self.pools[subreddit]
+
+            # swap-remove keeps taking a post O(1)
+            idx = random.randrange(len(pool))
+            pool[idx], pool[-1] = pool[-1], pool[idx]
+            post = pool.pop()
+
+            if not pool:
+                candidates.remove(subreddit)
+            if post.id not in exclude:
+                return post
+        return None
+
+    async def select(
+        self,
+        subreddits: Collection[str],
+        exclude: Collection[str],
+        max_fetches: int = 3,
+        timeout: float = 10.0,
+    ) -> RedditPost:
+        """Takes a post, refilling pools on demand within a fixed budget
+
+        Subreddits are refilled in a random order weighted by their recent
+        image post yield, so subreddits that rarely have image posts are
+        tried last.
+
+        Parameters
+        ----------
+        subreddits : Collection[str]
+            Subreddits to pick from (no r/)
+        exclude : Collection[str]
+            IDs of posts that must not be returned (e.g. already sent)
+        max_fetches : int
+            (Optional) Listing requests allowed. (Default=3)
+        timeout : float
+            (Optional) Seconds allowed for listing requests. (Default=10.0)
+
+        Returns
+        -------
+        RedditPost
+            Post
+
+        Raises
+        ----------
+        RedditPostPool.NoPosts: when no eligible post is found within budget
+        """
+        post = self.take(subreddits, exclude)
+        if post is not None:
+            return post
+
+        deadline = time.monotonic() + timeout
+        untried = list(subreddits)
+        for _ in range(max_fetches):
+            remaining = deadline - time.monotonic()
+            if not untried or remaining <= 0:
+                break
+
+            # unknown subreddits are assumed to be worth trying
+            weights = [max(self.yields.get(s, 100.0), 1.0) for s in untried]
+            subreddit = random.choices(untried, weights=weights)[0]
+            untried.remove(subreddit)
+
+            try:
+                await asyncio.wait_for(self.refresh(subreddit), remaining)
+            except asyncio.TimeoutError:
+                break
+            except Exception as e:
+                self.bot.logger.info(f"Could not refresh r/{subreddit}: {e}")
+                continue
+
+            post = self.take(subreddits, exclude)
+            if post is not None:
+                return post
+
+        raise RedditPostPool.NoPosts
@@ -0,0 +1,81 @@
+import math
+import time
+from typing import TYPE_CHECKING, Dict
+
+from discord.ext import commands, tasks
+
+if TYPE_CHECKING:
+    from discord.gateway import DiscordWebSocket
+
+    from studybot import StudyBot
+
+
+class ShardStats:
+    """Per-shard gateway latency and event rates
+
+    Event rates are taken from the gateway sequence number of each shard,
+    which Discord increments for every event it sends, so counting costs
+    nothing per event. Heartbeat latencies are recorded in the bot's
+    metrics as the "gateway" command, one stage per shard.
+
+    Parameters
+    ----------
+    bot : StudyBot
+        Bot instance, sharded or not
+
+    Attributes
+    ----------
+    rates : Dict[int, float]
+        Events per second of each shard since the previous sample
+    events : Dict[int, int]
+        Events received by each shard since startup
+    latencies : Dict[int, float]
+        Last heartbeat latency of each shard in seconds
+    """
+
+    def __init__(self, bot: "StudyBot") -> None:
+        self.bot = bot
+        self.rates: Dict[int, float] = {}
+        self.events: Dict[int, int] = {}
+        self.latencies: Dict[int, float] = {}
+        self.sequences: Dict[int, int] = {}
+        self.sampled = time.monotonic()
+
+    def websockets(self) -> Dict[int, "DiscordWebSocket"]:
+        """Returns the connected gateway websocket of each shard
+
+        Returns
+        -------
+        Dict[int, DiscordWebSocket]
+            Websocket per shard ID
+        """
+        if isinstance(self.bot, commands.AutoShardedBot):
+            # discord.py has no public accessor for a shard's websocket
+            return {
+                shard_id: self.bot._get_websocket(shard_id=shard_id)
+                for shard_id in self.bot.shards
+            }
+        if self.bot.ws is None:
+            return {}
+        return {self.bot.shard_id or 0: self.bot.ws}
+
+    @tasks.loop(seconds=60)
+    async def sample(self) -> None:
+        """Updates the event rates and latencies of every shard"""
+        now = time.monotonic()
+        elapsed = now - self.sampled
+        self.sampled = now
+
+        for shard_id, ws in self.websockets().items():
+            sequence = ws.sequence or 0
+            previous = self.sequences.get(shard_id, 0)
+            # sequences restart when a shard opens a new session
+            received = sequence - previous if sequence >= previous else sequence
+            self.sequences[shard_id] = sequence
+
+            self.events[shard_id] = self.events.get(shard_id, 0) + received
+            self.rates[shard_id] = received / elapsed if elapsed else 0.0
+            # latency is infinite until the first heartbeat is acknowledged
+            if math.isfinite(ws.latency):
+                self.latencies[shard_id] = ws.latency
+                self.bot.metrics.observe("gateway", f"shard{shard_id}", ws.latency)
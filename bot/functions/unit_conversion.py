@@ -0,0 +1,158 @@
+import re
+from functools import lru_cache
+
+import pint
+from quantulum3 import parser
+
+
+class UnitConverter:
+    """Metric/imperial unit conversion engine
+
+    Holds a single shared pint.UnitRegistry so the (slow) unit definitions
+    are only loaded once, instead of once per message.
+
+    Parameters
+    ----------
+    cache_size : int
+        (Optional) Number of converted quantities to memoize. (Default=512)
+
+    Attributes
+    ----------
+    registry : pint.UnitRegistry
+        Shared unit registry
+    conversions : dict
+        Mapping of source unit name to its imperial/metric equivalent
+    accepted : int
+        Number of messages passed on to the quantity parser
+    rejected : int
+        Number of messages rejected by the pre-filter
+    """
+
+    # Number directly followed by a convertible unit (e.g. "5km", "3.2 miles")
+    quantity_pattern = re.compile(
+        r"(?<![\w.])\d+(?:[.,]\d+)?\s?-?\s?"
+        r"(?:km|kilomet(?:er|re)s?|mi|miles?|ft|feet|foot|cm|centimet(?:er|re)s?"
+        r"|m|met(?:er|re)s?|in|inch(?:es)?|lbs?|pounds?|kg|kilograms?)\b",
+        re.IGNORECASE,
+    )
+
+    # Source unit -> unit it is converted to
+    conversion_table = {
+        "kilometer": "mile",
+        "mile": "kilometer",
+        "foot": "meter",
+        "meter": "foot",
+        "inch": "centimeter",
+        "centimeter": "inch",
+        "pound": "kilogram",
+        "kilogram": "pound",
+    }
+
+    def __init__(self, cache_size: int = 512) -> None:
+        self.registry = pint.UnitRegistry()
+
+        # Resolve target units once so conversions skip unit string parsing
+        self.conversions = {
+            src: self.registry.Unit(dst) for src, dst in self.conversion_table.items()
+        }
+
+        self.convert = lru_cache(maxsize=cache_size)(self._convert)
+
+        self.accepted = 0
+        self.rejected = 0
+
+    def detect(self, text: str) -> bool:
+        """Cheaply checks if text contains a numeric, convertible quantity
+
+        Used as a pre-filter so the quantity parser only runs on messages
+        that can actually produce a conversion.
+
+        Parameters
+        ----------
+        text : str
+            Raw message content
+
+        Returns
+        -------
+        bool
+            True if a number followed by a known unit is found
+        """
+        if self.quantity_pattern.search(text) is None:
+            self.rejected += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def parse(self, text: str) -> str | None:
+        """Extracts the first quantity from raw text
+
+        Parameters
+        ----------
+        text : str
+            Raw message content
+
+        Returns
+        -------
+        str | None
+            Surface text of the quantity (e.g. "5 km"), None if not found
+        """
+        quantities = parser.parse(text.lower())
+        return quantities[0].surface if quantities else None
+
+    def convert_text(self, text: str) -> str | None:
+        """Extracts and converts the first quantity in raw text
+
+        Parameters
+        ----------
+        text : str
+            Raw message content
+
+        Returns
+        -------
+        str | None
+            "<before> is <after>" string, None if nothing is convertible
+        """
+        surface = self.parse(text)
+        return self.convert(surface) if surface is not None else None
+
+    def _convert(self, surface: str) -> str | None:
+        """Converts a quantity to its imperial/metric equivalent
+
+        Wrapped with an LRU cache as UnitConverter.convert
+
+        Parameters
+        ----------
+        surface : str
+            Quantity string (e.g. "5 km")
+
+        Returns
+        -------
+        str | None
+            "<before> is <after>" string, None if the unit is not convertible
+        """
+        try:
+            parsed_quant: pint.Quantity = self.registry(surface)
+        except Exception:
+            return None
+
+        if not isinstance(parsed_quant, pint.Quantity):
+            return None
+
+        target = self.conversions.get(str(parsed_quant.units))
+        if target is None:
+            return None
+
+        converted_quant = parsed_quant.to(target)
+        u_before = format(parsed_quant, "~P")
+        u_after = format(round(converted_quant, 2), "~P")
+        return f"{u_before} is {u_after}"
+
+    def cache_info(self):
+        """Returns cache statistics of converted quantities
+
+        Returns
+        -------
+        functools._CacheInfo
+            Hits, misses, maxsize and currsize of the conversion cache
+        """
+        return self.convert.cache_info()
@@ -0,0 +1,245 @@
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from typing import AsyncIterator, Dict, Set, Tuple
+
+import aiohttp
+
+# Connection limits of each pool, (total, per host)
+default_pools = {
+    "google": (8, 8),
+    "reddit": (8, 8),
+    "images": (32, 4),
+}
+
+# URLs requested to open connections of a new session before it is used
+default_warmup = {
+    "google": "https://www.google.com",
+    "reddit": "https://www.reddit.com",
+}
+
+
+class PoolStats:
+    """Request counters of a pool, kept across rotations"""
+
+    __slots__ = ("requests", "errors", "timeouts", "active", "peak")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.active = 0
+        self.peak = 0
+
+
+class WebClient:
+    """Pools of HTTP connections for the hosts the bot talks to
+
+    Each pool is its own ClientSession, so a burst of image checks cannot
+    use up the connections needed by Google or Reddit. Resolved hosts are
+    cached, and every request has default total and connect timeouts
+    unless it passes its own.
+
+    Parameters
+    ----------
+    pools : Dict[str, Tuple[int, int]]
+        (Optional) Connection limits per pool name, as (total, per host).
+        (Default=default_pools)
+    timeout : aiohttp.ClientTimeout
+        (Optional) Default request timeout.
+        (Default=ClientTimeout(total=15, connect=5))
+    dns_ttl : int
+        (Optional) Seconds resolved hosts are cached. (Default=300)
+    keepalive_timeout : float
+        (Optional) Seconds idle connections are kept open. (Default=60.0)
+    warmup : Dict[str, str]
+        (Optional) URL per pool requested before new sessions are used.
+        (Default=default_warmup)
+
+    Attributes
+    ----------
+    sessions : Dict[str, aiohttp.ClientSession]
+        Session per pool, empty until opened
+    stats : Dict[str, PoolStats]
+        Request counters per pool
+    in_flight : Counter
+        Running requests per session, used to drain rotated sessions
+    retired : Set[aiohttp.ClientSession]
+        Rotated sessions not yet closed
+    drain_tasks : Set[asyncio.Task]
+        Running drains, referenced so they are not garbage collected
+    """
+
+    def __init__(
+        self,
+        pools: Dict[str, Tuple[int, int]] = default_pools,
+        timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(total=15, connect=5),
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 60.0,
+        warmup: Dict[str, str] = default_warmup,
+    ) -> None:
+        self.pools = pools
+        self.timeout = timeout
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.warmup = warmup
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.stats = {name: PoolStats() for name in pools}
+        self.in_flight: Counter = Counter()
+        self.retired: Set[aiohttp.ClientSession] = set()
+        self.drain_tasks: Set[asyncio.Task] = set()
+
+    def build(self) -> Dict[str, aiohttp.ClientSession]:
+        """Creates a new session for every pool
+
+        Returns
+        -------
+        Dict[str, aiohttp.ClientSession]
+            Session per pool
+        """
+        return {
+            name: aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=limit,
+                    limit_per_host=limit_per_host,
+                    ttl_dns_cache=self.dns_ttl,
+                    keepalive_timeout=self.keepalive_timeout,
+                ),
+                timeout=self.timeout,
+            )
+            for name, (limit, limit_per_host) in self.pools.items()
+        }
+
+    @contextlib.asynccontextmanager
+    async def request(
+        self, pool: str, method: str, url: str, **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Sends a request through a pool
+
+        Parameters
+        ----------
+        pool : str
+            Pool name (e.g. "google")
+        method : str
+            HTTP method
+        url : str
+            Request URL
+        **kwargs
+            Passed to aiohttp.ClientSession.request
+
+        Yields
+        ------
+        aiohttp.ClientResponse
+            Response, released when the block exits
+        """
+        session = self.sessions[pool]
+        stats = self.stats[pool]
+        stats.requests += 1
+        stats.active += 1
+        stats.peak = max(stats.peak, stats.active)
+        self.in_flight[session] += 1
+        try:
+            async with session.request(method, url, **kwargs) as resp:
+                yield resp
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise
+        except aiohttp.ClientError:
+            stats.errors += 1
+            raise
+        finally:
+            stats.active -= 1
+            self.in_flight[session] -= 1
+            if self.in_flight[session] <= 0:
+                del self.in_flight[session]
+
+    def get(self, pool: str, url: str, **kwargs):
+        """Sends a GET request through a pool, see WebClient.request"""
+        return self.request(pool, "GET", url, **kwargs)
+
+    def head(self, pool: str, url: str, **kwargs):
+        """Sends a HEAD request through a pool, see WebClient.request"""
+        return self.request(pool, "HEAD", url, **kwargs)
+
+    async def drain(self, session: aiohttp.ClientSession, timeout: float) -> None:
+        """Closes a session once its running requests finish
+
+        Parameters
+        ----------
+        session : aiohttp.ClientSession
+            Session no longer given to new requests
+        timeout : float
+            Seconds to wait before closing regardless
+        """
+        deadline = time.monotonic() + timeout
+        while self.in_flight[session] and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+        self.retired.discard(session)
+        await session.close()
+
+    async def warm(self, sessions: Dict[str, aiohttp.ClientSession]) -> None:
+        """Opens connections of new sessions to the hosts they serve
+
+        Parameters
+        ----------
+        sessions : Dict[str, aiohttp.ClientSession]
+            Sessions from WebClient.build
+
+        Raises
+        ----------
+        aiohttp.ClientError, asyncio.TimeoutError : when a host is unreachable
+        """
+
+        async def warm_pool(session: aiohttp.ClientSession, url: str) -> None:
+            async with session.head(url) as resp:
+                await resp.read()
+
+        await asyncio.gather(
+            *(
+                warm_pool(sessions[name], url)
+                for name, url in self.warmup.items()
+                if name in sessions
+            )
+        )
+
+    async def rotate(self, timeout: float = 30.0) -> None:
+        """Replaces every session without interrupting requests
+
+        New sessions are warmed before being swapped in, so no request
+        waits on a cold connection. Requests already running finish on the
+        old sessions, which are closed in the background once drained.
+        If warming fails the old sessions are kept.
+
+        Parameters
+        ----------
+        timeout : float
+            (Optional) Seconds old sessions are given to drain. (Default=30.0)
+
+        Raises
+        ----------
+        aiohttp.ClientError, asyncio.TimeoutError : when warming fails
+        """
+        new_sessions = self.build()
+        try:
+            await self.warm(new_sessions)
+        except Exception:
+            # the first sessions are still needed, even if hosts are down
+            if self.sessions:
+                await asyncio.gather(*(s.close() for s in new_sessions.values()))
+                raise
+            self.sessions = new_sessions
+            raise
+
+        old_sessions, self.sessions = self.sessions, new_sessions
+        for session in old_sessions.values():
+            self.retired.add(session)
+            task = asyncio.create_task(self.drain(session, timeout))
+            self.drain_tasks.add(task)
+            task.add_done_callback(self.drain_tasks.discard)
+
+    async def close(self) -> None:
+        """Closes every session, including those still draining"""
+        sessions = [*self.sessions.values(), *self.retired]
+        self.retired.clear()
+        await asyncio.gather(*(s.close() for s in sessions))
@@ -1,13 +1,27 @@
 import asyncio
+import logging
+import multiprocessing
 import os
+import queue
+import signal
+import time
+from typing import Dict, List
 
 from dotenv import load_dotenv
 
-from studybot import StudyBot
+# Clusters run one process per shard range, and need sharded bots
+load_dotenv()
+clusters = int(os.getenv("CLUSTERS", "0"))
+if clusters > 0:
+    os.environ["SHARDED"] = "true"
 
+from studybot import StudyBot  # noqa: E402
 
-def main():
-    # Set event loop
+logger = logging.getLogger("launcher")
+
+
+def set_event_loop_policy() -> None:
+    """Uses uvloop for the event loop if it is installed"""
     try:
         import uvloop
     except ImportError:
@@ -15,15 +29,264 @@ def main():
     else:
         asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
+
+def shard_ranges(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Splits shards into contiguous ranges of near equal size
+
+    Parameters
+    ----------
+    shard_count : int
+        Total number of shards
+    cluster_count : int
+        Number of ranges
+
+    Returns
+    -------
+    List[List[int]]
+        Shard IDs per cluster
+    """
+    size, extra = divmod(shard_count, cluster_count)
+    ranges, start = [], 0
+    for i in range(cluster_count):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def run_cluster(
+    cluster_id: int,
+    shard_ids: List[int],
+    shard_count: int,
+    cluster_count: int,
+    bot_token: str,
+    metrics_queue: multiprocessing.Queue,
+) -> None:
+    """Runs the bot for a range of shards, in a worker process
+
+    Parameters
+    ----------
+    cluster_id : int
+        Index of the cluster
+    shard_ids : List[int]
+        Shards run by this cluster
+    shard_count : int
+        Total number of shards
+    cluster_count : int
+        Total number of clusters
+    bot_token : str
+        Discord bot token
+    metrics_queue : multiprocessing.Queue
+        Queue the exported metrics are sent to the supervisor through
+    """
+    set_event_loop_policy()
+    bot = StudyBot(
+        shard_ids=shard_ids,
+        shard_count=shard_count,
+        cluster_id=cluster_id,
+        cluster_count=cluster_count,
+    )
+    # the supervisor writes the metrics file for all clusters
+    bot.metrics.sinks = [lambda text: metrics_queue.put((cluster_id, text))]
+    bot.run(bot_token)
+
+
+class Supervisor:
+    """Runs clusters in worker processes and restarts them if they crash
+
+    Parameters
+    ----------
+    bot_token : str
+        Discord bot token
+    cluster_count : int
+        Number of worker processes
+    shard_count : int
+        Total number of shards, split between the clusters
+    metrics_file : str
+        (Optional) File the metrics of every cluster are written to.
+        (Default=None)
+    identify_delay : float
+        (Optional) Seconds waited per shard between starting clusters, as
+        Discord only allows one shard to connect at a time. (Default=5.0)
+
+    Attributes
+    ----------
+    workers : Dict[int, multiprocessing.Process]
+        Worker process per cluster
+    restarts : Dict[int, int]
+        Times each cluster has been restarted
+    metrics : Dict[int, str]
+        Last exported metrics of each cluster
+
+    Raises
+    ----------
+    ValueError: when there are more clusters than shards
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        cluster_count: int,
+        shard_count: int,
+        metrics_file: str | None = None,
+        identify_delay: float = 5.0,
+    ) -> None:
+        self.bot_token = bot_token
+        self.cluster_count = cluster_count
+        self.shard_count = shard_count
+        self.metrics_file = metrics_file
+        self.identify_delay = identify_delay
+        if cluster_count > shard_count:
+            raise ValueError(f"{cluster_count} clusters need at least as many shards")
+        self.ranges = shard_ranges(shard_count, cluster_count)
+
+        self.context = multiprocessing.get_context("spawn")
+        self.metrics_queue = self.context.Queue()
+        self.workers: Dict[int, multiprocessing.Process] = {}
+        self.started: Dict[int, float] = {}
+        self.backoff: Dict[int, float] = {}
+        self.restarts: Dict[int, int] = {i: 0 for i in range(cluster_count)}
+        self.metrics: Dict[int, str] = {}
+        self.running = True
+
+    def start(self, cluster_id: int) -> None:
+        """Starts the worker process of a cluster
+
+        Parameters
+        ----------
+        cluster_id : int
+            Index of the cluster
+        """
+        worker = self.context.Process(
+            target=run_cluster,
+            args=(
+                cluster_id,
+                self.ranges[cluster_id],
+                self.shard_count,
+                self.cluster_count,
+                self.bot_token,
+                self.metrics_queue,
+            ),
+            name=f"cluster-{cluster_id}",
+        )
+        worker.start()
+        self.workers[cluster_id] = worker
+        self.started[cluster_id] = time.monotonic()
+        logger.info(
+            f"Started cluster {cluster_id} (pid {worker.pid}) "
+            + f"with shards {self.ranges[cluster_id]}"
+        )
+
+    def check(self) -> None:
+        """Restarts crashed workers, backing off if they keep crashing"""
+        for cluster_id, worker in self.workers.items():
+            if worker.is_alive() or not self.running:
+                continue
+
+            # clusters that keep failing soon after starting are restarted
+            # less and less often, up to every 5 minutes
+            uptime = time.monotonic() - self.started[cluster_id]
+            backoff = self.backoff.get(cluster_id, self.identify_delay)
+            backoff = self.identify_delay if uptime > 600 else min(backoff * 2, 300)
+            if uptime < backoff:
+                continue
+
+            logger.warning(
+                f"Cluster {cluster_id} exited with code {worker.exitcode}, restarting"
+            )
+            self.backoff[cluster_id] = backoff
+            self.restarts[cluster_id] += 1
+            self.start(cluster_id)
+
+    def collect_metrics(self) -> None:
+        """Receives metrics sent by the clusters"""
+        while True:
+            try:
+                cluster_id, text = self.metrics_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.metrics[cluster_id] = text
+
+    def write_metrics(self) -> None:
+        """Writes the metrics of all clusters to the metrics file"""
+        lines = [
+            "# HELP studybot_stage_seconds Duration of command stages",
+            "# TYPE studybot_stage_seconds histogram",
+        ]
+        # each cluster exports its own header
+        for _, text in sorted(self.metrics.items()):
+            lines.extend(line for line in text.splitlines() if not line.startswith("#"))
+        lines.extend(
+            [
+                "# HELP studybot_cluster_restarts Times a cluster was restarted",
+                "# TYPE studybot_cluster_restarts counter",
+            ]
+        )
+        lines.extend(
+            f'studybot_cluster_restarts{{cluster="{cluster_id}"}} {count}'
+            for cluster_id, count in self.restarts.items()
+        )
+
+        tmp_path = f"{self.metrics_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.metrics_file)
+
+    def stop(self, *_) -> None:
+        """Asks every worker to shut down gracefully"""
+        self.running = False
+        for worker in self.workers.values():
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGINT)
+
+    def run(self) -> None:
+        """Starts every cluster and supervises them until stopped"""
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        for cluster_id, shard_ids in enumerate(self.ranges):
+            self.start(cluster_id)
+            if cluster_id < self.cluster_count - 1:
+                time.sleep(self.identify_delay * len(shard_ids))
+
+        last_export = time.monotonic()
+        while self.running:
+            time.sleep(1.0)
+            self.check()
+            self.collect_metrics()
+            if self.metrics_file and time.monotonic() - last_export >= 60:
+                self.write_metrics()
+                last_export = time.monotonic()
+
+        for worker in self.workers.values():
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+        logger.info("All clusters stopped")
+
+
+def main():
     # Get environment variables
-    load_dotenv()
     if os.getenv("DEBUG_MODE") == "true":
         bot_token = os.getenv("BOT_TOKEN_DEV")
     else:
         bot_token = os.getenv("BOT_TOKEN")
 
-    # Run bot
-    StudyBot().run(bot_token)
+    # Run bot, in one process per cluster if CLUSTERS is set
+    if clusters > 0:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s %(name)s [%(levelname)s]: %(message)s",
+        )
+        Supervisor(
+            bot_token,
+            cluster_count=clusters,
+            shard_count=int(os.getenv("SHARD_COUNT") or clusters),
+            metrics_file=os.getenv("METRICS_FILE"),
+        ).run()
+    else:
+        set_event_loop_policy()
+        StudyBot().run(bot_token)
 
 
 if __name__ == "__main__":
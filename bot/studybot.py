@@ -1,5 +1,4 @@
 import asyncio
-import datetime
 import hashlib
 import logging
 import os
@@ -7,12 +6,24 @@ import sys
 import time
 import traceback
 from logging.handlers import TimedRotatingFileHandler
+from typing import List
 
-import aiohttp
 import discord
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
+from functions.admission import AdmissionController, TokenBucket
+from functions.audit_log import AuditLog
+from functions.cache import TTLCache
+from functions.executor import ExecutorService
+from functions.expiring_set import ExpiringSet
+from functions.image_validation import ImageValidator
+from functions.intents import minimal_intents
+from functions.json_decoding import get_decoder
 from functions.loading_message import get_loading_message
+from functions.metrics import Metrics
+from functions.queue_logging import BoundedQueueHandler
+from functions.shard_stats import ShardStats
+from functions.web_client import WebClient
 
 initial_cogs = ("cogs.utilities", "cogs.searchengines", "cogs.onhandling", "cogs.fun")
 default_command_prefix = "&"
@@ -25,6 +36,23 @@ application_id = (
     else os.getenv("APPLICATION_ID")
 )
 logging_channel_id = int(os.getenv("LOG_CHANNEL_ID"))
+reddit_history_file = os.getenv("REDDIT_HISTORY_FILE")
+metrics_file = os.getenv("METRICS_FILE")
+json_decoder = os.getenv("JSON_DECODER")
+
+# Sharded mode runs one gateway connection per shard, SHARD_COUNT defaults
+# to the count recommended by Discord
+sharded = os.getenv("SHARDED") == "true"
+default_shard_count = (
+    int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None
+)
+bot_base = commands.AutoShardedBot if sharded else commands.Bot
+
+# Lean mode only requests the intents the cogs need, caches fewer messages
+# and no members. Searches wait for raw edits, so they do not need their
+# command message to still be cached
+lean_mode = os.getenv("LEAN_MODE") == "true"
+lean_max_messages = int(os.getenv("MAX_MESSAGES") or 250)
 
 
 class UserError(Exception):
@@ -47,9 +75,29 @@ class UserCancel(KeyboardInterrupt):
     pass
 
 
-class StudyBot(commands.Bot):
+class StudyBot(bot_base):
     """Class for the SearchIO Bot
 
+    Runs as an AutoShardedBot when SHARDED=true, otherwise as a Bot.
+    When LEAN_MODE=true, only the intents needed by the cogs are requested
+    and members are not cached
+
+    Parameters
+    ----------
+    shard_ids : List[int]
+        (Optional) Shards run by this bot in sharded mode, all if None.
+        (Default=None)
+    shard_count : int
+        (Optional) Total shard count in sharded mode, SHARD_COUNT if None.
+        (Default=None)
+    cluster_id : int
+        (Optional) Cluster of this bot when run by the cluster launcher,
+        kept apart in log files, metrics and sent post history.
+        (Default=None)
+    cluster_count : int
+        (Optional) Number of clusters sharing the outbound rate limits.
+        (Default=1)
+
     Attributes
     ----------
     owner_id : int
@@ -58,11 +106,47 @@ class StudyBot(commands.Bot):
     application_id : str
         Discord app ID of the bot
 
+    cluster_id : int | None
+        Cluster of this bot, None when not run by the cluster launcher
+
     loading_message : () -> str
         Function that gives a randomised loading msg
 
-    session : aiohttp.ClientSession
-        Pregenerated aiohttp ClientSession
+    web : functions.web_client.WebClient
+        Pooled HTTP sessions for Google, Reddit and image hosts
+
+    metrics : functions.metrics.Metrics
+        Per-command, per-stage latency histograms
+
+    json_loads : (bytes | str) -> Any
+        JSON decoder for API responses, orjson unless JSON_DECODER is set
+
+    shard_stats : functions.shard_stats.ShardStats
+        Per-shard gateway latency and event rates
+
+    executor : functions.executor.ExecutorService
+        Worker pool for CPU-bound work (HTML/JSON/unit parsing)
+
+    reddit_sentPosts : functions.expiring_set.ExpiringSet
+        IDs of Reddit posts sent in the last 24hrs
+
+    audit_log : functions.audit_log.AuditLog
+        Batched command usage log for the logging channel
+
+    search_cache : functions.cache.TTLCache
+        Parsed search results of recent searches
+
+    search_admission : functions.admission.AdmissionController
+        Per-user/per-guild fair queue for searches
+
+    google_limiter : functions.admission.TokenBucket
+        Rate limit of outbound requests to Google
+
+    image_validator : functions.image_validation.ImageValidator
+        Cached, concurrency-limited checks of image result URLs
+
+    log_queue : functions.queue_logging.BoundedQueueHandler
+        Handler queueing log records for the writer thread
 
     UserError : studybot.UserError
         Custom exception for user-attributed error
@@ -71,7 +155,13 @@ class StudyBot(commands.Bot):
         Raised when user cancels their command
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        shard_ids: List[int] | None = None,
+        shard_count: int | None = None,
+        cluster_id: int | None = None,
+        cluster_count: int = 1,
+    ) -> None:
         async def command_logging(ctx: commands.Context):
             """Log command usage before invoking the command
 
@@ -79,31 +169,48 @@ class StudyBot(commands.Bot):
             ----------
             ctx : commands.Context
             """
+            # Start timing the command, recorded by command_timing
+            ctx.invoked_at = time.perf_counter()
 
             self.logger.info(str(ctx.author) + " used " + ctx.command.name)
 
-            # Log all command uses
+            # Log all command uses, sent in batches by the audit log
             if os.getenv("DEBUG_MODE") != "true":
-                embed = discord.Embed(
-                    title=ctx.command.name,
-                    description=ctx.message.content,
-                    timestamp=datetime.datetime.now(),
+                self.audit_log.record(ctx)
+
+        async def command_timing(ctx: commands.Context):
+            """Record the total duration of a command after invoking it
+
+            Searches stay invoked while their results can be paged through
+
+            Parameters
+            ----------
+            ctx : commands.Context
+            """
+            invoked_at = getattr(ctx, "invoked_at", None)
+            if invoked_at is not None:
+                self.metrics.observe(
+                    ctx.command.qualified_name,
+                    "total",
+                    time.perf_counter() - invoked_at,
                 )
-                embed.set_author(name=ctx.author, icon_url=ctx.author.avatar.url)
-                await self.logging_channel.send(embed=embed)
 
         def setup_logging() -> None:
-            """Initializes logging system"""
+            """Initializes logging system
+
+            Records are queued by the logger and written to stdout and the
+            log files on a separate thread
+            """
             fmt = logging.Formatter("%(asctime)s %(name)s [%(levelname)s]: %(message)s")
+            suffix = f"-{cluster_id}" if cluster_id is not None else ""
+            level = logging.DEBUG if os.getenv("DEBUG_MODE") == "true" else logging.INFO
 
             std = logging.StreamHandler(sys.stdout)
-            std.setLevel(
-                logging.DEBUG if os.getenv("DEBUG_MODE") == "true" else logging.INFO
-            )
+            std.setLevel(level)
             std.setFormatter(fmt)
 
             rot = TimedRotatingFileHandler(
-                filename="runtime.log",
+                filename=f"runtime{suffix}.log",
                 when="M",
                 utc=True,
                 interval=1,
@@ -114,22 +221,39 @@ class StudyBot(commands.Bot):
             rot.setLevel(logging.INFO)
             rot.setFormatter(fmt)
 
-            err = logging.FileHandler(filename="error.log", encoding="utf-8")
+            err = logging.FileHandler(filename=f"error{suffix}.log", encoding="utf-8")
             err.setLevel(logging.ERROR)
             err.setFormatter(fmt)
 
+            self.log_queue = BoundedQueueHandler()
+            self.log_listener = self.log_queue.listen(rot, std, err)
+
+            # no handler writes below level, so skip those records entirely
             self.logger = logging.getLogger(__name__)
-            self.logger.setLevel(logging.DEBUG)
-            self.logger.addHandler(rot)
-            self.logger.addHandler(std)
-            self.logger.addHandler(err)
+            self.logger.setLevel(level)
+            self.logger.addHandler(self.log_queue)
 
-        intents = discord.Intents.all()
+        sharding = (
+            {"shard_ids": shard_ids, "shard_count": shard_count or default_shard_count}
+            if sharded
+            else {}
+        )
+        caching = (
+            {
+                "intents": minimal_intents(initial_cogs),
+                "max_messages": lean_max_messages,
+                "chunk_guilds_at_startup": False,
+                "member_cache_flags": discord.MemberCacheFlags.none(),
+            }
+            if lean_mode
+            else {"intents": discord.Intents.all()}
+        )
         super().__init__(
             command_prefix=default_command_prefix,
-            intents=intents,
             owner_id=bot_owner,
             application_id=application_id,
+            **sharding,
+            **caching,
         )
 
         # Set standard errors
@@ -139,23 +263,80 @@ class StudyBot(commands.Bot):
         # Initialise loading message function
         self.loading_message = get_loading_message
 
+        # Initialise command latency metrics
+        self.metrics = Metrics(
+            path=metrics_file,
+            labels={"cluster": str(cluster_id)} if cluster_id is not None else None,
+        )
+
+        # Initialise HTTP connection pools, opened by bot_refresh
+        self.web = WebClient()
+
+        # Initialise gateway health metrics
+        self.shard_stats = ShardStats(self)
+
+        # Initialise JSON decoder for API responses
+        self.json_loads = get_decoder(json_decoder)
+
+        # Initialise worker pool for CPU-bound parsing
+        self.executor = ExecutorService()
+
         # Set up logging
         setup_logging()
 
-        # Sync check for slash commands
+        # Sync check for slash commands, which only the first cluster syncs
+        self.cluster_id = cluster_id
         self.isSynced = False
 
         # Add bot-account check
         self.add_check(lambda ctx: not ctx.author.bot)
 
-        # Add Reddit sent post cache
-        self.reddit_sentPosts = {}
+        # Add Reddit sent post cache, posts are not repeated within 24hrs
+        self.reddit_sentPosts = ExpiringSet(
+            86400,
+            path=(
+                f"{reddit_history_file}.{cluster_id}"
+                if reddit_history_file is not None and cluster_id is not None
+                else reddit_history_file
+            ),
+        )
+
+        # Add search result cache, keyed by search URL
+        self.search_cache = TTLCache(maxsize=256, ttl=900.0)
+
+        # Add search admission queue and outbound Google rate limit, which
+        # is split between clusters
+        self.search_admission = AdmissionController()
+        self.google_limiter = TokenBucket(
+            rate=1.0 / cluster_count, burst=max(1, 5 // cluster_count)
+        )
+
+        # Add image URL validation shared by image searches
+        self.image_validator = ImageValidator(self)
 
-        # Add pre-command logging
+        # Add pre-command logging and per-command timing
+        self.audit_log = AuditLog(self)
         self.before_invoke(command_logging)
+        self.after_invoke(command_timing)
 
     async def setup_hook(self) -> None:
         self.bot_refresh.start()
+        self.audit_log.flush.start()
+        self.shard_stats.sample.start()
+        if self.metrics.sinks:
+            self.metrics.export.start()
+
+    async def close(self) -> None:
+        self.audit_log.flush.cancel()
+        await self.audit_log.flush()
+        try:
+            self.reddit_sentPosts.save()
+        except OSError as e:
+            self.logger.error(f"Could not save sent Reddit posts: {e}")
+        self.executor.shutdown()
+        await self.web.close()
+        await super().close()
+        self.log_listener.stop()
 
     async def on_ready(self) -> None:
         # Set presence
@@ -163,8 +344,8 @@ class StudyBot(commands.Bot):
         await self.change_presence(status=discord.Status.idle, activity=game)
         self.logger.debug("Changing discord status")
 
-        # Sync slash commands
-        if not self.isSynced:
+        # Sync slash commands once, from a single cluster
+        if not self.isSynced and self.cluster_id in (None, 0):
             tree_cmds = [c.name for c in self.tree.get_commands()]
             for cmd in await self.tree.fetch_commands():
                 if cmd.name not in tree_cmds:
@@ -175,20 +356,34 @@ class StudyBot(commands.Bot):
             else:
                 await self.tree.sync()
 
+            self.isSynced = True
             self.logger.debug("Syncing slash commands")
 
-        # Set logging channel
+        # Set logging channel, which is fetched when its guild is not cached
+        # (e.g. in cluster mode, when the guild is run by another cluster)
         self.logging_channel = self.get_channel(logging_channel_id)
+        if self.logging_channel is None:
+            try:
+                self.logging_channel = await self.fetch_channel(logging_channel_id)
+            except discord.DiscordException as e:
+                self.logger.error(f"Could not fetch logging channel: {e}")
 
         # Log ready event
         self.logger.info("-" * 15)
         self.logger.info("Bot successfully loaded")
         return
 
+    async def on_shard_ready(self, shard_id: int) -> None:
+        self.logger.info(f"Shard {shard_id} ready")
+
     async def on_command_error(self, ctx: commands.Context, e: Exception) -> None:
         def hash(i: str) -> str:
             return hashlib.sha1(str.encode(i)).hexdigest()
 
+        # Unwrap errors raised inside commands
+        if isinstance(e, commands.errors.CommandInvokeError):
+            e = e.original
+
         # If user made an error in their command
         if isinstance(e, self.UserError):
             await ctx.reply(embed=discord.Embed(description=e.reason))
@@ -244,17 +439,15 @@ class StudyBot(commands.Bot):
     @tasks.loop(hours=10)
     async def bot_refresh(self):
         self.logger.info("Refreshing bot")
-        # Initialise persistent ClientSession
-        if "session" in dir(self):
-            self.logger.info("Reloading aiohttp session")
-            await self.session.close()
-
+        # Swap in new, warmed HTTP sessions, old ones close once drained
+        self.logger.info("Reloading HTTP sessions")
         t0 = time.time()
-        self.session = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(keepalive_timeout=360.0, limit=None)
-        )
-        await (await self.session.get("https://www.google.com")).text()
-        self.logger.debug(f"aiohttp session loaded in {round(time.time()-t0, 5)} sec")
+        try:
+            with self.metrics.timer("bot_refresh", "session"):
+                await self.web.rotate()
+            self.logger.debug(f"HTTP sessions loaded in {round(time.time()-t0, 5)} sec")
+        except Exception as e:
+            self.logger.error(f"Could not warm new HTTP sessions: {e}")
 
         # Load cogs
         try: